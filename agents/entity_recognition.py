@@ -1,4 +1,5 @@
 import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional
 
 from database.ontology_store import OntologyStore
@@ -14,7 +15,8 @@ class EntityRecognitionAgent:
     def __init__(
         self, 
         entity_recognition_model: GLiNERModel,
-        ontology_store: OntologyStore
+        ontology_store: OntologyStore,
+        max_workers: int = 4
     ):
         """
         Initialize the entity recognition agent.
@@ -22,10 +24,14 @@ class EntityRecognitionAgent:
         Args:
             entity_recognition_model: Model for entity extraction
             ontology_store: Store for ontology access
+            max_workers: Maximum number of ontology searches run concurrently
         """
         self.model = entity_recognition_model
         self.ontology_store = ontology_store
         
+        # Worker threads are started on demand and reused across queries
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="entity-enrichment")
+        
         # Entity types we're interested in
         self.entity_types = [
             "CLASS",          # Ontology classes
@@ -304,41 +310,34 @@ class EntityRecognitionAgent:
         """
         enriched = organized_entities.copy()
         
-        # Enrich class entities
-        for entity in enriched.get("class", []):
-            entity_text = entity["text"]
-            
-            # Search for matching classes in the ontology
-            matching_classes = self.ontology_store.search_classes(entity_text)
-            
-            if matching_classes:
-                # Add ontology information to the entity
-                entity["ontology_matches"] = matching_classes
+        # Pair each class, property and instance entity with its ontology search
+        searches = [
+            (entity, search)
+            for entity_type, search in (
+                ("class", self.ontology_store.search_classes),
+                ("property", self.ontology_store.search_properties),
+                ("instance", self.ontology_store.search_instances)
+            )
+            for entity in enriched.get(entity_type, [])
+        ]
         
-        # Enrich property entities
-        for entity in enriched.get("property", []):
-            entity_text = entity["text"]
-            
-            # Search for matching properties in the ontology
-            matching_properties = self.ontology_store.search_properties(entity_text)
-            
-            if matching_properties:
-                # Add ontology information to the entity
-                entity["ontology_matches"] = matching_properties
+        # Searches are independent GraphDB round trips, so run them concurrently
+        if len(searches) > 1:
+            matches = list(self._executor.map(lambda item: item[1](item[0]["text"]), searches))
+        else:
+            matches = [search(entity["text"]) for entity, search in searches]
         
-        # Enrich instance entities
-        for entity in enriched.get("instance", []):
-            entity_text = entity["text"]
-            
-            # Search for matching instances in the ontology
-            matching_instances = self.ontology_store.search_instances(entity_text)
-            
-            if matching_instances:
+        for (entity, _), entity_matches in zip(searches, matches):
+            if entity_matches:
                 # Add ontology information to the entity
-                entity["ontology_matches"] = matching_instances
+                entity["ontology_matches"] = entity_matches
         
         return enriched
     
+    def shutdown(self):
+        """Stop the worker threads used for ontology searches."""
+        self._executor.shutdown(wait=True)
+    
     def _clean_entity_text(self, text: str) -> str:
         """
         Clean up entity text by removing stopwords and extra whitespace.
@@ -352,10 +351,11 @@ class EntityRecognitionAgent:
         # Remove extra whitespace
         text = re.sub(r'\s+', ' ', text).strip()
         
-        # Remove leading/trailing stopwords
+        # Remove leading/trailing stopwords by moving indices instead of popping from the list front
         words = text.split()
-        while words and words[0].lower() in self.stopwords:
-            words.pop(0)
-        while words and words[-1].lower() in self.stopwords:
-            words.pop()
-        return ' '.join(words)
+        start, end = 0, len(words)
+        while start < end and words[start].lower() in self.stopwords:
+            start += 1
+        while end > start and words[end - 1].lower() in self.stopwords:
+            end -= 1
+        return ' '.join(words[start:end])
@@ -1,13 +1,14 @@
-import json
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Mapping
 
 import autogen
+import orjson
 
 from config.agent_config import get_agent_config
 from utils.logging_utils import setup_logging
 
 logger = setup_logging(app_name="nl-to-sparql", enable_colors=True)
 
+
 class MasterAgent:
     """
     Master agent that coordinates the Natural Language to SPARQL conversion system.
@@ -51,20 +52,20 @@ class MasterAgent:
         Returns:
             Dictionary containing the results of the query processing
         """
-        logger.info(f"Processing query: {user_query}")
+        logger.info("Processing query: %s", user_query)
         result = {"original_query": user_query, "conversation_history": conversation_history}
         try:
             # Step 1: Refine the query
             refined_query = self._refine_query(user_query, conversation_history)
             result["refined_query"] = refined_query
-            logger.info(f"Refined query: {refined_query}")
+            logger.info("Refined query: %s", refined_query)
 
             # Step 2: Recognize entities in the query
             entities = self._recognize_entities(refined_query)
             if hasattr(entities, 'content'):  # Handle ChatResult object
                 entities = {"all_entities": []}  # Fallback if response is invalid
             result["entities"] = entities
-            logger.info(f"Recognized {len(entities.get('all_entities', []))} entities")
+            logger.info("Recognized %d entities", len(entities.get('all_entities', [])))
             
             # Step 3: Map entities to ontology terms
             mapped_entities = self._map_entities(entities, refined_query)
@@ -77,7 +78,7 @@ class MasterAgent:
                     "unknown": entities.get("all_entities", [])
                 }
             result["mapped_entities"] = mapped_entities
-            logger.info(f"Mapped entities to ontology terms")
+            logger.info("Mapped entities to ontology terms")
 
             # Step 4: Construct SPARQL query
             sparql_query_result = self._construct_sparql(refined_query, mapped_entities)
@@ -89,56 +90,52 @@ class MasterAgent:
                         "entities_used": mapped_entities
                     }
                 }
+            sparql_query = sparql_query_result.get("sparql", "")
+            query_metadata = sparql_query_result.get("metadata", {})
             result["sparql"] = sparql_query_result.get("sparql")
-            result["query_metadata"] = sparql_query_result.get("metadata", {})
-            logger.info(f"Constructed SPARQL query")
+            result["query_metadata"] = query_metadata
+            logger.info("Constructed SPARQL query")
             
             # Step 5: Validate the SPARQL query
-            validation_result = self._validate_sparql(
-                sparql_query_result.get("sparql", ""),
-                sparql_query_result.get("metadata", {})
-            )
+            validation_result = self._validate_sparql(sparql_query, query_metadata)
             if hasattr(validation_result, 'content'):  # Handle ChatResult object
                 validation_result = {"is_valid": False, "feedback": "Validation error occurred"}
             result["validation"] = validation_result
-            logger.info(f"Validation result: {'Valid' if validation_result.get('is_valid', False) else 'Invalid'}")
+            is_valid = validation_result.get("is_valid", False)
+            logger.info("Validation result: %s", 'Valid' if is_valid else 'Invalid')
             
             # If validation failed, try to fix the query
-            if not validation_result.get("is_valid", False):
-                logger.info(f"Attempting to fix invalid SPARQL query")
-                fixed_query_result = self._fix_sparql(
-                    sparql_query_result.get("sparql", ""),
-                    sparql_query_result.get("metadata", {}),
-                    validation_result
-                )
+            if not is_valid:
+                logger.info("Attempting to fix invalid SPARQL query")
+                fixed_query_result = self._fix_sparql(sparql_query, query_metadata, validation_result)
                 
                 if hasattr(fixed_query_result, 'content'):  # Handle ChatResult object
                     fixed_query_result = {
                         "sparql": "",
-                        "metadata": sparql_query_result.get("metadata", {})
+                        "metadata": query_metadata
                     }
                 
-                if fixed_query_result.get("sparql"):
-                    result["sparql"] = fixed_query_result.get("sparql")
-                    result["query_metadata"] = fixed_query_result.get("metadata", {})
+                fixed_sparql = fixed_query_result.get("sparql")
+                if fixed_sparql:
+                    fixed_metadata = fixed_query_result.get("metadata", {})
+                    result["sparql"] = fixed_sparql
+                    result["query_metadata"] = fixed_metadata
                     
                     # Validate the fixed query
-                    validation_result = self._validate_sparql(
-                        fixed_query_result.get("sparql", ""),
-                        fixed_query_result.get("metadata", {})
-                    )
+                    validation_result = self._validate_sparql(fixed_sparql, fixed_metadata)
                     if hasattr(validation_result, 'content'):  # Handle ChatResult object
                         validation_result = {"is_valid": False, "feedback": "Validation error occurred"}
                     result["validation"] = validation_result
-                    logger.info(f"Fixed query validation: {'Valid' if validation_result.get('is_valid', False) else 'Invalid'}")
+                    is_valid = validation_result.get("is_valid", False)
+                    logger.info("Fixed query validation: %s", 'Valid' if is_valid else 'Invalid')
             
             # Step 6: Execute the query if validation passed
-            if validation_result.get("is_valid", False):
+            if is_valid:
                 execution_result = self._execute_query(result["sparql"])
                 if hasattr(execution_result, 'content'):  # Handle ChatResult object
                     execution_result = {"success": False, "error": "Query execution error occurred"}
                 result["execution"] = execution_result
-                logger.info(f"Query execution {'successful' if execution_result.get('success', False) else 'failed'}")
+                logger.info("Query execution %s", 'successful' if execution_result.get('success', False) else 'failed')
                 
                 # Step 7: Generate response from the execution results
                 response = self._generate_response(
@@ -149,14 +146,14 @@ class MasterAgent:
                 if hasattr(response, 'content'):  # Handle ChatResult object
                     response = str(response.content)
                 result["response"] = response
-                logger.info(f"Generated response")
+                logger.info("Generated response")
             else:
                 # Generate error response if validation failed
                 error_response = f"I'm sorry, but I couldn't create a valid SPARQL query for your question. {validation_result.get('feedback', '')}"
                 result["response"] = error_response
-                logger.info(f"Generated error response due to validation failure")
+                logger.info("Generated error response due to validation failure")
         except Exception as e:
-            logger.error(f"Error processing query: {e}")
+            logger.error("Error processing query: %s", e)
             result["error"] = str(e)
             result["response"] = f"I'm sorry, but an error occurred while processing your question: {str(e)}"
         return result
@@ -171,7 +168,7 @@ class MasterAgent:
             refined_query = self.slave_agents["query_refinement"].refine_query(raw_query, conversation_history)
             return refined_query
         except Exception as e:
-            logger.error(f"Error refining query: {e}")
+            logger.error("Error refining query: %s", e)
             # Return original query if refinement fails
             return raw_query
 
@@ -226,7 +223,7 @@ class MasterAgent:
         self, 
         sparql_query: str,
         query_metadata: Dict[str, Any]
-    ) -> Dict[str, Any]:
+    ) -> Mapping[str, Any]:
         """Delegate SPARQL validation to the sparql validation slave agent."""
         if "sparql_validation" not in self.slave_agents:
             return {"is_valid": True}  # Assume valid if agent not available
@@ -239,7 +236,7 @@ class MasterAgent:
         self, 
         sparql_query: str,
         query_metadata: Dict[str, Any],
-        validation_result: Dict[str, Any]
+        validation_result: Mapping[str, Any]
     ) -> Dict[str, Any]:
         """Try to fix an invalid SPARQL query by reconstructing it."""
         if "sparql_construction" not in self.slave_agents:
@@ -288,7 +285,7 @@ class MasterAgent:
         """Delegate response generation to the response generation slave agent."""
         if "response_generation" not in self.slave_agents:
             # Fallback to simple JSON dump if agent not available
-            return f"Here are the results: {json.dumps(execution_result, indent=2)}"
+            return f"Here are the results: {orjson.dumps(execution_result, option=orjson.OPT_INDENT_2, default=str).decode()}"
         
         return self.slave_agents["response_generation"].generate_response(
             refined_query,
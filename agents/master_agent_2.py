@@ -1,4 +1,3 @@
-import json
 from typing import Any, Dict, List
 
 import autogen
@@ -50,21 +49,21 @@ class MasterAgent:
         Returns:
             SPARQL query
         """
-        logger.info(f"Processing query: {user_query}")
+        logger.info("Processing query: %s", user_query)
         result = {"original_query": user_query, "conversation_history": conversation_history}
         try:
             # Step 1: Refine the query
             # conversation_history = None
             refined_query = self._refine_query(user_query, conversation_history)
             result["refined_query"] = refined_query
-            logger.info(f"Refined query: {refined_query}")
+            logger.info("Refined query: %s", refined_query)
 
             # Step 2: Recognize entities in the query
             entities = self._recognize_entities(refined_query)
             if hasattr(entities, 'content'):  # Handle ChatResult object
                 entities = {"all_entities": []}  # Fallback if response is invalid
             result["entities"] = entities
-            logger.info(f"Recognized {len(entities.get('all_entities', []))} entities")
+            logger.info("Recognized %d entities", len(entities.get('all_entities', [])))
 
             # Step 3: Map entities to ontology terms
             mapped_entities = self._map_entities(entities, refined_query)
@@ -77,37 +76,37 @@ class MasterAgent:
                     "unknown": entities.get("all_entities", [])
                 }
             result["mapped_entities"] = mapped_entities
-            logger.info(f"Mapped entities to ontology terms")
+            logger.info("Mapped entities to ontology terms")
 
             # Step 4: Planning 
             plan = self._formulate_plan(refined_query)
             result["plan"] = plan
-            logger.info("Create plan for SPARQL query successfully: {}".format(plan))
+            logger.info("Create plan for SPARQL query successfully: %s", plan)
 
             # Step 5: Validation the plan
             validation_result = self._validate_plan(plan, refined_query)
             result["validation"] = validation_result
-            logger.info("Validation result: {}".format(validation_result))
+            logger.info("Validation result: %s", validation_result)
 
             if not validation_result.get("is_valid", False):
                 feedback = validation_result.get("feedback", None)
                 plan = self._formulate_plan(refined_query, feedback)
                 result["plan"] = plan
-                logger.info("Fixed plan successfully: {}".format(plan))
+                logger.info("Fixed plan successfully: %s", plan)
                 validation_result = self._validate_plan(plan, refined_query)
                 result["validation"] = validation_result
-                logger.info("Validation result: {}".format(validation_result))
+                logger.info("Validation result: %s", validation_result)
 
             if validation_result.get("is_valid", False):
                 response = self._generate_response(plan, mapped_entities)
                 result["response"] = response
-                logger.info(f"Generated response successfully")
+                logger.info("Generated response successfully")
             else:
                 error_response = f"I'm sorry, but I couldn't create a valid SPARQL query for your question. {validation_result.get('feedback', '')}"
                 result["response"] = error_response
-                logger.info(f"Generated error response due to validation failure")
+                logger.info("Generated error response due to validation failure")
         except Exception as e:
-            logger.error(f"Error processing query: {e}")
+            logger.error("Error processing query: %s", e)
             result["error"] = str(e)
             result["response"] = f"I'm sorry, but an error occurred while processing your question: {str(e)}"
         return result
@@ -122,7 +121,7 @@ class MasterAgent:
             refined_query = self.slave_agents["query_refinement"].refine_query(raw_query, conversation_history)
             return refined_query
         except Exception as e:
-            logger.error(f"Error refining query: {e}")
+            logger.error("Error refining query: %s", e)
             # Return original query if refinement fails
             return raw_query
 
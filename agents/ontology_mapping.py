@@ -1,8 +1,10 @@
-import json
+import re
+from difflib import SequenceMatcher
 from typing import Any, Dict, List, Optional
 
 import autogen
 import numpy as np
+import orjson
 from rdflib import Graph, Literal, URIRef
 from rdflib.namespace import OWL, RDF, RDFS
 from sentence_transformers import SentenceTransformer
@@ -10,6 +12,12 @@ from sentence_transformers import SentenceTransformer
 from config.agent_config import OPEN_API_KEY
 from database.ontology_store import OntologyStore
 
+# Patterns for literal type inference and LLM response parsing, compiled once at import
+_DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+_DATETIME_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}')
+_JSON_BLOCK_PATTERN = re.compile(r'```(json)?\s*({.*?})\s*```', re.DOTALL)
+_JSON_OBJECT_PATTERN = re.compile(r'({.*})', re.DOTALL)
+
 
 class OntologyMappingAgent:
     """
@@ -22,7 +30,8 @@ class OntologyMappingAgent:
         ontology_path: Optional[str] = None,
         ontology_endpoint: Optional[str] = None,
         embedding_model_name: str = "all-MiniLM-L6-v2",
-        ontology_store: Optional[OntologyStore] = None  # Add this parameter
+        ontology_store: Optional[OntologyStore] = None,  # Add this parameter
+        embedding_model: Optional[SentenceTransformer] = None
     ):
         """
         Initialize the ontology mapping agent.
@@ -32,40 +41,37 @@ class OntologyMappingAgent:
             ontology_endpoint: SPARQL endpoint for remote ontology access
             embedding_model_name: Name of the embedding model for semantic matching
             ontology_store: Optional pre-initialized ontology store object
+            embedding_model: Already loaded embedding model to share instead of loading embedding_model_name
         """
         # Initialize ontology graph
         self.graph = Graph()
         
         # Use provided ontology_store if available, otherwise create new one
         if ontology_store:
-            self.graph = ontology_store.graph
             self.local_path = ontology_store.local_path
             self.endpoint_url = ontology_store.endpoint_url
-            # Reuse the ontology store's cached data
-            self.class_hierarchy = ontology_store.classes
-            self.property_domains_ranges = ontology_store.properties
             self.instances = ontology_store.instances
         else:
-            # Load ontology as before
             self.local_path = ontology_path
             self.endpoint_url = ontology_endpoint
-            
-            if ontology_path:
-                self._load_local_ontology(ontology_path)
-            elif ontology_endpoint:
-                self._load_remote_ontology(ontology_endpoint)
-                
-            # Build indices
-            self.class_hierarchy = self._build_class_hierarchy()
-            self.property_domains_ranges = self._build_property_domains_ranges()
         
-        # Initialize embedding model for semantic matching
-        self.embedding_model = SentenceTransformer(embedding_model_name)
+        # Share the store's parsed graph; a GraphDB-backed store keeps it empty, so load as before
+        if ontology_store and len(ontology_store.graph) > 0:
+            self.graph = ontology_store.graph
+        elif self.local_path:
+            self._load_local_ontology(self.local_path)
+        elif self.endpoint_url:
+            self._load_remote_ontology(self.endpoint_url)
+        
+        # Initialize embedding model for semantic matching, reusing a loaded one when given
+        self.embedding_model = (
+            embedding_model if embedding_model is not None else SentenceTransformer(embedding_model_name)
+        )
         
         # Cache for ontology term embeddings
         self.term_embeddings = {}
         
-        # Cache for ontology structure
+        # Cache for ontology structure, built once from the (possibly shared) graph
         self.class_hierarchy = self._build_class_hierarchy()
         self.property_domains_ranges = self._build_property_domains_ranges()
         
@@ -295,87 +301,67 @@ Analyze the context, term descriptions, and ontology structure to find the best
         entity_text: str, 
         query_context: str
     ) -> Optional[Dict[str, Any]]:
-        """
-        Map an entity to an ontology class.
-        
-        Args:
-            entity_text: The entity text to map
-            query_context: The full query for context
-            
-        Returns:
-            Mapped class information or None if no match
-        """
-        # First, try exact match with class labels
-        for class_uri, class_info in self.class_hierarchy.items():
-            for label in class_info["labels"]:
-                if entity_text.lower() == label.lower():
-                    return {
-                        "text": entity_text,
-                        "uri": class_uri,
-                        "label": label,
-                        "type": "class",
-                        "confidence": 1.0
-                    }
-        
-        # If no exact match, try semantic matching
-        matches = self._semantic_match(entity_text, self.class_hierarchy, "class")
-        if matches:
-            best_match = matches[0]
-            return {
-                "text": entity_text,
-                "uri": best_match["uri"],
-                "label": best_match.get("matched_label", ""),
-                "type": "class",
-                "confidence": best_match["similarity"]
-            }
-        return
+        """Map an entity to an ontology class."""
+        return self._map_to_term(entity_text, query_context, "class")
     
     def _map_to_property(
         self, 
         entity_text: str, 
         query_context: str
+    ) -> Optional[Dict[str, Any]]:
+        """Map an entity to an ontology property."""
+        return self._map_to_term(entity_text, query_context, "property")
+    
+    def _map_to_term(
+        self, 
+        entity_text: str, 
+        query_context: str,
+        term_type: str
     ) -> Optional[Dict[str, Any]]:
         """
-        Map an entity to an ontology property.
+        Map an entity to an ontology class or property.
         
         Args:
             entity_text: The entity text to map
             query_context: The full query for context
+            term_type: Type of term to map to ('class' or 'property')
             
         Returns:
-            Mapped property information or None if no match
+            Mapped term information or None if no match
         """
-        # First, try exact match with property labels
-        for prop_uri, prop_info in self.property_domains_ranges.items():
-            for label in prop_info["labels"]:
-                if entity_text.lower() == label.lower():
-                    return {
-                        "text": entity_text,
-                        "uri": prop_uri,
-                        "label": label,
-                        "type": "property",
-                        "property_type": prop_info["type"],
-                        "domains": prop_info["domains"],
-                        "ranges": prop_info["ranges"],
-                        "confidence": 1.0
-                    }
+        term_dict = self.class_hierarchy if term_type == "class" else self.property_domains_ranges
+        
+        # First, try exact match with term labels
+        match = None
+        entity_lower = entity_text.lower()
+        for term_uri, term_info in term_dict.items():
+            for label in term_info["labels"]:
+                if entity_lower == label.lower():
+                    match = {"uri": term_uri, "matched_label": label, "similarity": 1.0}
+                    break
+            if match:
+                break
         
         # If no exact match, try semantic matching
-        matches = self._semantic_match(entity_text, self.property_domains_ranges, "property")
-        if matches:
-            best_match = matches[0]
-            prop_info = self.property_domains_ranges[best_match["uri"]]
-            return {
-                "text": entity_text,
-                "uri": best_match["uri"],
-                "label": best_match.get("matched_label", ""),
-                "type": "property",
-                "property_type": prop_info["type"],
-                "domains": prop_info["domains"],
-                "ranges": prop_info["ranges"],
-                "confidence": best_match["similarity"]
-            }
-        return
+        if match is None:
+            matches = self._semantic_match(entity_text, term_dict, term_type)
+            if not matches:
+                return None
+            match = matches[0]
+        
+        mapped_term = {
+            "text": entity_text,
+            "uri": match["uri"],
+            "label": match.get("matched_label", ""),
+            "type": term_type
+        }
+        if term_type == "property":
+            prop_info = term_dict[match["uri"]]
+            mapped_term["property_type"] = prop_info["type"]
+            mapped_term["domains"] = prop_info["domains"]
+            mapped_term["ranges"] = prop_info["ranges"]
+        mapped_term["confidence"] = match["similarity"]
+        return mapped_term
     
     def _map_to_instance(
         self, 
@@ -407,18 +393,23 @@ Analyze the context, term descriptions, and ontology structure to find the best
         """
         
         try:
+            def to_python(term):
+                # Single attribute lookup instead of hasattr() followed by the call
+                convert = getattr(term, "toPython", None)
+                return convert() if convert is not None else str(term)
+            
             # Execute query directly on the graph
             results = []
             qres = self.graph.query(query)
+            entity_lower = entity_text.lower()
             
-            for row in qres:
-                instance_uri = row.instance.toPython() if hasattr(row.instance, "toPython") else str(row.instance)
-                instance_label = row.label.toPython() if hasattr(row.label, "toPython") else str(row.label)
-                instance_type = row.type.toPython() if hasattr(row.type, "toPython") else str(row.type)
+            for instance, label, instance_class in qres:
+                instance_uri = to_python(instance)
+                instance_label = to_python(label)
+                instance_type = to_python(instance_class)
                 
                 # Calculate string similarity
-                from difflib import SequenceMatcher
-                similarity = SequenceMatcher(None, entity_text.lower(), instance_label.lower()).ratio()
+                similarity = SequenceMatcher(None, entity_lower, instance_label.lower()).ratio()
                 
                 results.append({
                     "uri": instance_uri,
@@ -427,12 +418,10 @@ Analyze the context, term descriptions, and ontology structure to find the best
                     "similarity": similarity
                 })
             
-            # Sort by similarity
-            results.sort(key=lambda x: x["similarity"], reverse=True)
-            
-            # Return the best match if similarity is above threshold
-            if results and results[0]["similarity"] > 0.8:
-                best_match = results[0]
+            # Return the best match if similarity is above threshold; only the top result is
+            # needed, so pick it in one pass (first one on ties) instead of sorting all matches
+            best_match = max(results, key=lambda x: x["similarity"], default=None)
+            if best_match is not None and best_match["similarity"] > 0.8:
                 return {
                     "text": entity_text,
                     "uri": best_match["uri"],
@@ -464,14 +453,11 @@ Analyze the context, term descriptions, and ontology structure to find the best
             pass
         
         # Check if it's a date format (simple check)
-        import re
-        date_pattern = re.compile(r'^\d{4}-\d{2}-\d{2}$')
-        if date_pattern.match(text):
+        if _DATE_PATTERN.match(text):
             return "xsd:date"
         
         # Check if it's a dateTime format
-        datetime_pattern = re.compile(r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}')
-        if datetime_pattern.match(text):
+        if _DATETIME_PATTERN.match(text):
             return "xsd:dateTime"
         
         # Default to string
@@ -651,18 +637,17 @@ Return your mapping in the following JSON format:
         # Parse the JSON result
         try:
             # Find JSON content in response
-            import re
-            json_match = re.search(r'```(json)?\s*({.*?})\s*```', response_text, re.DOTALL)
+            json_match = _JSON_BLOCK_PATTERN.search(response_text)
             
             if json_match:
                 json_str = json_match.group(2)
-                mapping_result = json.loads(json_str)
+                mapping_result = orjson.loads(json_str)
             else:
                 # Try to find JSON without the code block
-                json_match = re.search(r'({.*})', response_text, re.DOTALL)
+                json_match = _JSON_OBJECT_PATTERN.search(response_text)
                 if json_match:
                     json_str = json_match.group(1)
-                    mapping_result = json.loads(json_str)
+                    mapping_result = orjson.loads(json_str)
                 else:
                     # Fallback if no JSON found
                     mapping_result = {
@@ -1,12 +1,15 @@
-import json
 from typing import Any, Dict, List, Optional
 
 import autogen
+import orjson
 
 from config.agent_config import get_agent_config
 from tools.sparql_tools import SPARQLTools
 from tools.template_tools import TemplateTools
 
+# Shared empty default for missing entity categories
+_EMPTY_ENTITIES = ()
+
 
 class PlanFormulationAgent:
     """
@@ -103,21 +106,22 @@ class PlanFormulationAgent:
             Complexity assessment ("simple", "complex", or "unsupported")
         """
         # Check if we have entities that can be mapped to a SPARQL query
-        has_classes = len(mapped_entities.get("classes", [])) > 0
-        has_properties = len(mapped_entities.get("properties", [])) > 0
-        has_instances = len(mapped_entities.get("instances", [])) > 0
+        has_classes = len(mapped_entities.get("classes", _EMPTY_ENTITIES)) > 0
+        has_properties = len(mapped_entities.get("properties", _EMPTY_ENTITIES)) > 0
+        has_instances = len(mapped_entities.get("instances", _EMPTY_ENTITIES)) > 0
         
         # Determine if query requires aggregation, grouping, or other complex features
-        requires_aggregation = any(term in refined_query.lower() for term in 
+        query_lower = refined_query.lower()
+        requires_aggregation = any(term in query_lower for term in 
                                  ["count", "average", "sum", "maximum", "minimum", "how many"])
         
-        requires_sorting = any(term in refined_query.lower() for term in 
+        requires_sorting = any(term in query_lower for term in 
                              ["top", "highest", "lowest", "most", "least", "order", "rank", "sort"])
         
-        requires_comparison = any(term in refined_query.lower() for term in 
+        requires_comparison = any(term in query_lower for term in 
                                 ["more than", "less than", "greater", "smaller", "between"])
         
-        requires_multi_hop = any(term in refined_query.lower() for term in 
+        requires_multi_hop = any(term in query_lower for term in 
                                ["related to", "connected to", "linked to", "path between", "indirect"])
         
         # Check for complex queries that need multiple SPARQL queries
@@ -150,10 +154,10 @@ class PlanFormulationAgent:
         """
         # Count entity types to find templates
         entity_counts = {
-            "classes": len(mapped_entities.get("classes", [])),
-            "properties": len(mapped_entities.get("properties", [])),
-            "instances": len(mapped_entities.get("instances", [])),
-            "literals": len(mapped_entities.get("literals", []))
+            "classes": len(mapped_entities.get("classes", _EMPTY_ENTITIES)),
+            "properties": len(mapped_entities.get("properties", _EMPTY_ENTITIES)),
+            "instances": len(mapped_entities.get("instances", _EMPTY_ENTITIES)),
+            "literals": len(mapped_entities.get("literals", _EMPTY_ENTITIES))
         }
         
         # Find templates that match the entity counts
@@ -248,7 +252,7 @@ class PlanFormulationAgent:
             
             if start_idx >= 0 and end_idx > start_idx:
                 plan_json = response_text[start_idx:end_idx]
-                plan = json.loads(plan_json)
+                plan = orjson.loads(plan_json)
             else:
                 # Fallback to a simple plan structure if no JSON found
                 plan = {
@@ -284,10 +288,10 @@ class PlanFormulationAgent:
             Complete prompt for the LLM
         """
         # Format the entities
-        entities_text = json.dumps(mapped_entities, indent=2)
+        entities_text = orjson.dumps(mapped_entities, option=orjson.OPT_INDENT_2, default=str).decode()
         
         # Format ontology info
-        ontology_text = json.dumps(ontology_info, indent=2)
+        ontology_text = orjson.dumps(ontology_info, option=orjson.OPT_INDENT_2, default=str).decode()
         
         # List available templates
         templates_list = ""
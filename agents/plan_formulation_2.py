@@ -5,7 +5,7 @@ from langchain.output_parsers import ResponseSchema
 from langchain.output_parsers import StructuredOutputParser
 from database.qdrant_client import QdrantClient
 from typing import List, Dict, Any, Optional
-import json
+import orjson
 
 class PlanFormulationAgent:
     """
@@ -78,7 +78,7 @@ class PlanFormulationAgent:
             try:
                 prompt = self._prepare_plan_prompt(refined_query)
                 plan = self.agent.invoke(prompt)
-                plan = json.loads(plan.content)
+                plan = orjson.loads(plan.content)
                 break
             except Exception as e:
                 print(e)
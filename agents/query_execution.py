@@ -1,14 +1,24 @@
+import hashlib
+import threading
 import time
+from collections import OrderedDict
+from types import MappingProxyType
 from typing import Any, Dict, Optional
 
 from SPARQLWrapper import (CSV, JSON, N3, RDFXML, TSV, TURTLE, XML,
                            SPARQLWrapper)
 
 # Configure logging
+from tools.sparql_tools import SPARQLTools
 from utils.logging_utils import setup_logging
 
 logger = setup_logging(app_name="nl-to-sparql", enable_colors=True)
 
+# Shared empty defaults for missing result fields
+_EMPTY_MAPPING = MappingProxyType({})
+_EMPTY_SEQUENCE = ()
+
+
 class QueryExecutionAgent:
     """
     Slave agent responsible for executing SPARQL queries.
@@ -19,7 +29,9 @@ class QueryExecutionAgent:
         self, 
         endpoint_url: Optional[str] = None,
         auth_token: Optional[str] = None,
-        default_graph: Optional[str] = None
+        default_graph: Optional[str] = None,
+        cache_size: int = 1024,
+        cache_ttl: float = 300
     ):
         """
         Initialize the query execution agent.
@@ -28,14 +40,35 @@ class QueryExecutionAgent:
             endpoint_url: URL of the SPARQL endpoint
             auth_token: Authentication token for the endpoint
             default_graph: Default graph URI
+            cache_size: Maximum number of query results to keep in the LRU cache
+            cache_ttl: Seconds a cached result stays valid
         """
         # Initialize endpoint settings
         self.endpoint_url = endpoint_url
         self.auth_token = auth_token
         self.default_graph = default_graph
         
-        # Result cache
-        self.result_cache = {}
+        # LRU result cache with a time-to-live per entry
+        self.result_cache = OrderedDict()
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        
+        # Configured SPARQLWrapper instances, reused per thread since they are not thread-safe
+        self._local = threading.local()
+        
+        # Queries currently executing, so concurrent duplicates wait for one round-trip;
+        # the in-flight table has its own lock so registrations don't contend with cache reads
+        self._inflight = {}
+        self._cache_lock = threading.Lock()
+        self._inflight_lock = threading.Lock()
+        
+        # Repeated identical errors are logged once per window, e.g. while the endpoint is down;
+        # queries fail from several threads at once, so the counters have their own lock
+        self.error_log_window = 10
+        self._last_error = None
+        self._last_error_time = 0.0
+        self._suppressed_errors = 0
+        self._error_lock = threading.Lock()
         
         # Default timeout in seconds
         self.timeout = 30
@@ -85,32 +118,79 @@ class QueryExecutionAgent:
         # Generate cache key if caching is enabled.
         cache_key = None
         if use_cache:
-            cache_key = f"{endpoint}_{result_format}_{hash(sparql_query)}"
-            if cache_key in self.result_cache:
-                cache_entry = self.result_cache[cache_key]
-                # Check if cache is still valid (less than 5 minutes old).
-                if time.time() - cache_entry["timestamp"] < 300:
-                    logger.info(f"Using cached result for query: {sparql_query[:50]}...")
-                    return cache_entry["result"]
-
+            query_digest = hashlib.blake2b(SPARQLTools.normalize_query(sparql_query).encode(), digest_size=16).hexdigest()
+            cache_key = f"{endpoint}_{result_format}_{query_digest}"
+            result = self._cached_result(cache_key)
+            if result is not None:
+                logger.info("Using cached result for query: %s...", sparql_query[:50])
+                return result
+            
+            with self._inflight_lock:
+                inflight = self._inflight.get(cache_key)
+                is_leader = inflight is None
+                if is_leader:
+                    inflight = self._inflight[cache_key] = (threading.Event(), [])
+            
+            done, outcome = inflight
+            if is_leader:
+                try:
+                    # A previous leader may have cached the result between the lookup and registration
+                    result = self._cached_result(cache_key)
+                    if result is None:
+                        result = self._run_query(sparql_query, endpoint, format_const, cache_key)
+                    outcome.append(result)
+                    return result
+                finally:
+                    with self._inflight_lock:
+                        self._inflight.pop(cache_key, None)
+                    done.set()
+            
+            # The same query is already running in another thread; share its result
+            done.wait()
+            if outcome:
+                logger.info("Reusing concurrent result for query: %s...", sparql_query[:50])
+                return outcome[0]
+        
+        return self._run_query(sparql_query, endpoint, format_const, cache_key)
+    
+    def _cached_result(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for a key if it is still within its time-to-live."""
+        with self._cache_lock:
+            cache_entry = self.result_cache.get(cache_key)
+            # Stale entries are overwritten on the next success.
+            if cache_entry is not None and time.monotonic() - cache_entry["timestamp"] < self.cache_ttl:
+                self.result_cache.move_to_end(cache_key)
+                return cache_entry["result"]
+        return None
+    
+    def _run_query(
+        self, 
+        sparql_query: str, 
+        endpoint: str, 
+        format_const: str, 
+        cache_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Send a SPARQL query to the endpoint and format the response.
+        
+        Args:
+            sparql_query: The SPARQL query to execute
+            endpoint: URL of the SPARQL endpoint
+            format_const: SPARQLWrapper return format constant
+            cache_key: Key under which a successful result is cached, if any
+            
+        Returns:
+            Query execution results
+        """
         try:
-            # Initialize SPARQL wrapper.
-            sparql = SPARQLWrapper(endpoint)
+            # Reuse a configured SPARQL wrapper for this endpoint.
+            sparql = self._get_wrapper(endpoint, format_const)
             sparql.setQuery(sparql_query)
-            sparql.setReturnFormat(format_const)
             sparql.setTimeout(self.timeout)
-
-            # Set default graph if specified.
-            if self.default_graph:
-                sparql.addDefaultGraph(self.default_graph)
-
-            # Set authentication if available.
-            if self.auth_token:
-                sparql.addCustomHttpHeader("Authorization", f"Bearer {self.auth_token}")
-            logger.info(f"Executing SPARQL query: {sparql_query[:50]}...")
-            start_time = time.time()
+            logger.info("Executing SPARQL query: %s...", sparql_query[:50])
+            start_ns = time.perf_counter_ns()
             results = sparql.query()
-            execution_time = time.time() - start_time
+            execution_time = (time.perf_counter_ns() - start_ns) / 1e9
             if format_const == JSON:
                 result_data = results.convert()
                 formatted_result = self._format_json_results(result_data, sparql_query)
@@ -150,15 +230,18 @@ class QueryExecutionAgent:
                 "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
                 "results": formatted_result
             }
-            if use_cache and cache_key:
-                self.result_cache[cache_key] = {
-                    "result": result,
-                    "timestamp": time.time()
-                }
+            if cache_key:
+                with self._cache_lock:
+                    self.result_cache[cache_key] = {
+                        "result": result,
+                        "timestamp": time.monotonic()
+                    }
+                    if len(self.result_cache) > self.cache_size:
+                        self.result_cache.popitem(last=False)
             return result
         except Exception as e:
             error_message = f"Error executing SPARQL query: {str(e)}"
-            logger.error(error_message)
+            self._log_error(error_message)
             return {
                 "success": False,
                 "error": error_message,
@@ -179,11 +262,12 @@ class QueryExecutionAgent:
         """
         # Determine query type from the query
         query_type = "SELECT"  # Default
-        if "ASK" in sparql_query.upper():
+        query_upper = sparql_query.upper()
+        if "ASK" in query_upper:
             query_type = "ASK"
-        elif "CONSTRUCT" in sparql_query.upper():
+        elif "CONSTRUCT" in query_upper:
             query_type = "CONSTRUCT"
-        elif "DESCRIBE" in sparql_query.upper():
+        elif "DESCRIBE" in query_upper:
             query_type = "DESCRIBE"
         
         # Format based on query type
@@ -215,11 +299,11 @@ class QueryExecutionAgent:
                 # This is a simplified approach, actual implementation would depend on the endpoint
                 
                 if isinstance(result_data, dict) and "results" in result_data:
-                    triples_data = result_data["results"].get("bindings", [])
+                    triples_data = result_data["results"].get("bindings", _EMPTY_SEQUENCE)
                     for binding in triples_data:
-                        subject = binding.get("subject", {}).get("value", "")
-                        predicate = binding.get("predicate", {}).get("value", "")
-                        object_val = binding.get("object", {}).get("value", "")
+                        subject = binding.get("subject", _EMPTY_MAPPING).get("value", "")
+                        predicate = binding.get("predicate", _EMPTY_MAPPING).get("value", "")
+                        object_val = binding.get("object", _EMPTY_MAPPING).get("value", "")
                         
                         if subject and predicate and object_val:
                             triples.append({
@@ -249,20 +333,20 @@ class QueryExecutionAgent:
             Formatted SELECT results
         """
         # Extract variables (column names)
-        variables = result_data.get("head", {}).get("vars", [])
+        variables = result_data.get("head", _EMPTY_MAPPING).get("vars", [])
         
         # Extract bindings (rows)
-        bindings = result_data.get("results", {}).get("bindings", [])
+        bindings = result_data.get("results", _EMPTY_MAPPING).get("bindings", _EMPTY_SEQUENCE)
         
         # Format rows
         rows = []
         for binding in bindings:
             row = {}
             for var in variables:
-                if var in binding:
-                    value = binding[var].get("value", "")
-                    datatype = binding[var].get("datatype", "")
-                    type_info = binding[var].get("type", "")
+                term = binding.get(var)
+                if term is not None:
+                    value = term.get("value", "")
+                    type_info = term.get("type", "")
                     
                     # Format based on type
                     if type_info == "uri":
@@ -274,7 +358,7 @@ class QueryExecutionAgent:
                         row[var] = {
                             "value": value,
                             "type": "literal",
-                            "datatype": datatype
+                            "datatype": term.get("datatype", "")
                         }
                     else:
                         row[var] = {
@@ -286,19 +370,87 @@ class QueryExecutionAgent:
             
             rows.append(row)
         
+        # Row count is taken once from the formatted list; bindings are never re-walked
+        row_count = len(rows)
         return {
             "format": "bindings",
             "variables": variables,
             "rows": rows,
-            "count": len(rows),
-            "info": f"Query returned {len(rows)} results with variables: {', '.join(variables)}"
+            "count": row_count,
+            "info": f"Query returned {row_count} results with variables: {', '.join(variables)}"
         }
     
+    def _log_error(self, error_message: str):
+        """Log an execution error, collapsing repeats of the same message within the window."""
+        with self._error_lock:
+            now = time.monotonic()
+            if error_message == self._last_error and now - self._last_error_time < self.error_log_window:
+                self._suppressed_errors += 1
+                if self._suppressed_errors == 1:
+                    # Report the repeats when the window closes, even if the error never recurs
+                    flush_timer = threading.Timer(
+                        self.error_log_window - (now - self._last_error_time),
+                        self._flush_suppressed_errors
+                    )
+                    flush_timer.daemon = True
+                    flush_timer.start()
+                return
+            
+            self._report_suppressed_errors()
+            self._last_error = error_message
+            self._last_error_time = now
+            logger.error("%s", error_message)
+    
+    def _flush_suppressed_errors(self):
+        """Report the repeats collapsed in a window once it has closed."""
+        with self._error_lock:
+            # A newer error may have opened a window of its own, with its own timer
+            if time.monotonic() - self._last_error_time >= self.error_log_window:
+                self._report_suppressed_errors()
+    
+    def _report_suppressed_errors(self):
+        """Log how often the last error was collapsed; the caller holds the error lock."""
+        if self._suppressed_errors:
+            logger.error("Previous error repeated %d more times", self._suppressed_errors)
+            self._suppressed_errors = 0
+    
     def clear_cache(self):
         """Clear the result cache."""
-        self.result_cache = {}
+        with self._cache_lock:
+            self.result_cache.clear()
         logger.info("Query result cache cleared")
     
+    def _get_wrapper(self, endpoint: str, format_const: str) -> SPARQLWrapper:
+        """
+        Get a SPARQL wrapper configured for the endpoint, creating it on first use.
+        
+        Args:
+            endpoint: URL of the SPARQL endpoint
+            format_const: SPARQLWrapper return format constant
+            
+        Returns:
+            SPARQLWrapper owned by the calling thread
+        """
+        wrappers = getattr(self._local, "wrappers", None)
+        if wrappers is None:
+            wrappers = self._local.wrappers = {}
+        
+        key = (endpoint, format_const, self.default_graph, self.auth_token)
+        sparql = wrappers.get(key)
+        if sparql is None:
+            sparql = SPARQLWrapper(endpoint)
+            sparql.setReturnFormat(format_const)
+            
+            # Set default graph if specified.
+            if self.default_graph:
+                sparql.addDefaultGraph(self.default_graph)
+            
+            # Set authentication if available.
+            if self.auth_token:
+                sparql.addCustomHttpHeader("Authorization", f"Bearer {self.auth_token}")
+            wrappers[key] = sparql
+        return sparql
+    
     def set_endpoint(
         self, 
         endpoint_url: str, 
@@ -320,4 +472,4 @@ class QueryExecutionAgent:
             
         if default_graph:
             self.default_graph = default_graph
-        logger.info(f"SPARQL endpoint updated: {endpoint_url}")
+        logger.info("SPARQL endpoint updated: %s", endpoint_url)
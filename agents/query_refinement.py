@@ -1,3 +1,4 @@
+import hashlib
 from typing import Any, Dict, List, Optional
 
 import autogen
@@ -92,7 +93,7 @@ class QueryRefinementAgent:
                 return raw_query
             return refined_query
         except Exception as e:
-            logger.error(f"Error in query refinement: {e}")
+            logger.error("Error in query refinement: %s", e)
             # Return the original query in case of any error
             return raw_query
     
@@ -116,29 +117,23 @@ class QueryRefinementAgent:
             return conversation_history
         
         try:
-            # Vectorize the query
-            query_embedding = self.embedding_model.embed(query)
-            
             # Prepare the conversation history for vector search
-            history_vectors = []
-            for i, item in enumerate(conversation_history):
-                if item.get("role") == "user":
-                    content = item.get("content", "")
-                    embedding = self.embedding_model.embed(content)
-                    history_vectors.append({
-                        "id": i,
-                        "content": content,
-                        "embedding": embedding
-                    })
+            user_turns = [
+                (i, item.get("content", ""))
+                for i, item in enumerate(conversation_history)
+                if item.get("role") == "user"
+            ]
+            
+            # Vectorize the query together with the user turns in a single batch
+            embeddings = self.embedding_model.embed([query] + [content for _, content in user_turns])
+            query_embedding = embeddings[0]
             
             # Calculate similarities
             similarities = []
-            for item in history_vectors:
-                similarity = self._cosine_similarity(query_embedding, item["embedding"])
+            for (i, _), embedding in zip(user_turns, embeddings[1:]):
+                similarity = self._cosine_similarity(query_embedding, embedding)
                 if similarity >= VECTOR_SIMILARITY_THRESHOLD:
-                    similarities.append((item["id"], similarity))
-            if similarities:
-                return []
+                    similarities.append((i, similarity))
 
             # Sort by similarity.
             similarities.sort(key=lambda x: x[1], reverse=True)
@@ -314,7 +309,6 @@ Include specific entity names whenever they're referenced directly or indirectly
             embedding = self.embedding_model.embed(original_query)
             
             # Generate a unique ID
-            import hashlib
             example_id = hashlib.md5(f"{conversation_history}|{original_query}|{refined_query}".encode()).hexdigest()
             
             # Store the example in the vector database
@@ -1,10 +1,36 @@
 # agents/response_generation.py
-import json
-from typing import Any, Dict, List, Optional
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Mapping, Optional
 
 import autogen
+import orjson
 
 from config.agent_config import get_agent_config
+from tools.sparql_tools import SPARQLTools
+
+
+# Per-run execution metadata that says nothing about the answer itself
+_VOLATILE_RESULT_FIELDS = frozenset({"execution_time", "timestamp"})
+
+
+def _stable_results(execution_results: Any) -> Any:
+    """Drop per-run metadata from execution results, including that of each plan step's result."""
+    if not isinstance(execution_results, Mapping):
+        return execution_results
+    stable = {key: value for key, value in execution_results.items() if key not in _VOLATILE_RESULT_FIELDS}
+    
+    # Tool execution nests one query result per plan step under "results"
+    step_results = stable.get("results")
+    if (
+        isinstance(step_results, Mapping)
+        and step_results
+        and all(isinstance(result, Mapping) and "success" in result for result in step_results.values())
+    ):
+        stable["results"] = {step: _stable_results(result) for step, result in step_results.items()}
+    return stable
 
 
 class ResponseGenerationAgent:
@@ -13,8 +39,15 @@ class ResponseGenerationAgent:
     Transforms technical API results into conversational, helpful responses.
     """
     
-    def __init__(self):
-        """Initialize the response generation agent."""
+    __slots__ = ("agent", "proxy", "response_cache", "cache_size", "_cache_lock")
+    
+    def __init__(self, cache_size: int = 1024):
+        """
+        Initialize the response generation agent.
+        
+        Args:
+            cache_size: Maximum number of generated responses to keep in the LRU cache
+        """
         # Get configuration for response generation agent
         agent_config = get_agent_config("response_generation")
         
@@ -31,12 +64,18 @@ class ResponseGenerationAgent:
             human_input_mode="NEVER",
             is_termination_msg=lambda x: True,  # Always terminate after one response
         )
+        
+        # LRU cache of generated responses keyed by a hash of the normalized inputs
+        self.response_cache = OrderedDict()
+        self.cache_size = cache_size
+        self._cache_lock = threading.Lock()
     
     def generate_response(
         self, 
         refined_query: str,
         sparql_query: str,
-        execution_results: Dict[str, Any]
+        execution_results: Dict[str, Any],
+        use_cache: bool = True
     ) -> str:
         """
         Generate a natural language response based on execution results.
@@ -45,10 +84,18 @@ class ResponseGenerationAgent:
             refined_query: The refined user query
             sparql_query: The current SPARQL query
             execution_results: Results from tool execution
+            use_cache: Whether to read and store the response in the response cache
             
         Returns:
             Natural language response to the user
         """
+        cache_key = None
+        if use_cache:
+            cache_key = self._cache_key(refined_query, sparql_query, execution_results)
+            cached = self._cached_response(cache_key)
+            if cached is not None:
+                return cached
+        
         # Prepare the prompt for the LLM
         prompt = self._prepare_response_prompt(refined_query, sparql_query, execution_results)
         
@@ -60,9 +107,73 @@ class ResponseGenerationAgent:
         response_text = response.summary.strip()
         # If response is empty, provide a fallback
         if not response_text:
-            response_text = "I'm sorry, I couldn't generate a proper response based on the information available."
+            return "I'm sorry, I couldn't generate a proper response based on the information available."
+        
+        if use_cache:
+            self._cache_response(cache_key, response_text)
         return response_text
     
+    async def generate_response_async(
+        self, 
+        refined_query: str,
+        sparql_query: str,
+        execution_results: Dict[str, Any],
+        use_cache: bool = True
+    ) -> str:
+        """
+        Generate a natural language response without blocking the running event loop.
+        
+        Args:
+            refined_query: The refined user query
+            sparql_query: The current SPARQL query
+            execution_results: Results from tool execution
+            use_cache: Whether to read and store the response in the response cache
+            
+        Returns:
+            Natural language response to the user
+        """
+        return await asyncio.to_thread(
+            self.generate_response, refined_query, sparql_query, execution_results, use_cache
+        )
+    
+    def _cache_key(
+        self, 
+        refined_query: str,
+        sparql_query: str,
+        execution_results: Dict[str, Any]
+    ) -> bytes:
+        """Build a cache key that ignores formatting differences and per-run metadata such as timings."""
+        payload = orjson.dumps(
+            [
+                " ".join(refined_query.casefold().split()),
+                SPARQLTools.normalize_query(sparql_query or ""),
+                _stable_results(execution_results)
+            ],
+            option=orjson.OPT_SORT_KEYS,
+            default=str
+        )
+        return hashlib.blake2b(payload, digest_size=16).digest()
+    
+    def _cached_response(self, cache_key: bytes) -> Optional[str]:
+        """Return the cached response for a key, if any."""
+        with self._cache_lock:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                self.response_cache.move_to_end(cache_key)
+            return cached
+    
+    def _cache_response(self, cache_key: bytes, response_text: str):
+        """Store a generated response, evicting the least recently used one when full."""
+        with self._cache_lock:
+            self.response_cache[cache_key] = response_text
+            if len(self.response_cache) > self.cache_size:
+                self.response_cache.popitem(last=False)
+    
+    def clear_cache(self):
+        """Clear the generated response cache."""
+        with self._cache_lock:
+            self.response_cache.clear()
+    
     def _prepare_response_prompt(
         self, 
         refined_query: str,
@@ -80,16 +191,14 @@ class ResponseGenerationAgent:
             Complete prompt for the LLM
         """
         # Format the execution results
-        results_text = json.dumps(execution_results, indent=2)
+        results_text = orjson.dumps(execution_results, option=orjson.OPT_INDENT_2, default=str).decode()
         
-        # Determine if there were any errors
-        has_errors = any("error" in result for result in execution_results.values() if isinstance(result, dict))
-        
-        # Check if results contain transaction data
-        has_transaction = any(
-            isinstance(result, dict) and "transaction" in result 
-            for result in execution_results.values()
-        )
+        # Determine if there were any errors and whether results contain transaction data, in one pass
+        has_errors = has_transaction = False
+        for result in execution_results.values():
+            if isinstance(result, dict):
+                has_errors = has_errors or "error" in result
+                has_transaction = has_transaction or "transaction" in result
         
         # Construct the complete prompt
         prompt = f"""I need you to create a natural, conversational response to a user's blockchain query.
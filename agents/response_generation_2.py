@@ -1,23 +1,25 @@
 from database.qdrant_client import QdrantClient
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
-from database.qdrant_client import QdrantClient
 from typing import List, Dict, Any, Optional
-import json
+import orjson
 
 from utils.constants import TOP_K_DRANT_QUERIES, QDRANT_SEARCH_THRESHOLD
 
 
 class ResponseGenerationAgent:
-    def __init__(self):
+    def __init__(self, qdrant_client: Optional[QdrantClient] = None):
         """
         Initialize the response generation agent
+        
+        Args:
+            qdrant_client: Existing Qdrant client to share instead of creating one
         """
         self.agent = ChatOpenAI(
             model="gpt-4o-mini",
             temperature=0.
         )
-        self.qdrant_client = QdrantClient()
+        self.qdrant_client = qdrant_client or QdrantClient()
         self.num_retry = 2
         self.top_k = TOP_K_DRANT_QUERIES
         self.collection_name = "ontology_embedding"
@@ -36,7 +38,7 @@ class ResponseGenerationAgent:
                 
             ) 
             step_query = self.agent.invoke(prompt)
-            step_query = json.loads(step_query.content)
+            step_query = orjson.loads(step_query.content)
             previous_queries.append(step_query)
 
         return previous_queries
@@ -1,10 +1,18 @@
+import asyncio
+import copy
+import hashlib
 import json
 import os
+import re
+import sys
+import threading
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional
 
-import autogen
+import orjson
 
 from config.agent_config import get_agent_config
+from tools.template_tools import TemplateTools
 
 
 class SPARQLConstructionAgent:
@@ -13,33 +21,42 @@ class SPARQLConstructionAgent:
     Builds queries based on intent, mapped entities, and query patterns.
     """
     
-    def __init__(self, templates_dir: Optional[str] = None):
+    __slots__ = (
+        "_agent", "_proxy", "template_tools", "templates_dir", "common_prefixes",
+        "_prefixes_prompt", "query_cache", "cache_size", "_inflight", "_cache_lock"
+    )
+    
+    def __init__(
+        self, 
+        templates_dir: Optional[str] = None, 
+        cache_size: int = 512,
+        template_tools: Optional[TemplateTools] = None
+    ):
         """
         Initialize the SPARQL construction agent.
         
         Args:
             templates_dir: Directory containing SPARQL query templates
+            cache_size: Maximum number of constructed queries to keep in the LRU cache
+            template_tools: Shared template tools whose loaded templates are reused
         """
-        # Get configuration for agent
-        agent_config = get_agent_config("sparql_construction")
-        
-        # Initialize the agent with AutoGen
-        self.agent = autogen.AssistantAgent(
-            name=agent_config["name"],
-            system_message=agent_config["system_message"],
-            llm_config=agent_config["llm_config"]
-        )
-        
-        # Initialize proxy agent for interaction
-        self.proxy = autogen.UserProxyAgent(
-            name="SPARQLConstructionProxy",
-            human_input_mode="NEVER",
-            is_termination_msg=lambda x: True,  # Always terminate after one response
-        )
-        
-        # Load SPARQL templates
-        self.templates_dir = templates_dir or os.path.join(os.path.dirname(__file__), "../templates/sparql")
-        self.templates = self._load_templates()
+        # AutoGen agents are only needed for LLM-based construction, so build them on first use
+        self._agent = None
+        self._proxy = None
+        
+        # Load SPARQL templates, reusing the ones already loaded by the template tools
+        if template_tools is None:
+            template_tools = TemplateTools(
+                templates_dir=templates_dir or os.path.join(os.path.dirname(__file__), "../templates/sparql")
+            )
+        self.templates_dir = template_tools.templates_dir
+        
+        # Seed an empty templates directory with the example templates
+        if not template_tools.templates:
+            self._create_example_templates()
+            template_tools.reload_templates()
+        self.template_tools = template_tools
+        print(f"Loaded {len(self.templates)} SPARQL query templates")
         
         # Common prefixes for SPARQL queries
         self.common_prefixes = {
@@ -48,6 +65,60 @@ class SPARQLConstructionAgent:
             "owl": "http://www.w3.org/2002/07/owl#",
             "xsd": "http://www.w3.org/2001/XMLSchema#"
         }
+        
+        # Prompt section listing the common prefixes, formatted once since they never change
+        self._prefixes_prompt = "\nCommon prefixes:\n" + "".join(
+            f"PREFIX {prefix}: <{uri}>\n" for prefix, uri in self.common_prefixes.items()
+        )
+        
+        # LRU cache of constructed queries keyed by a hash of the request
+        self.query_cache = OrderedDict()
+        self.cache_size = cache_size
+        
+        # Constructions currently in progress, so concurrent duplicates wait for one result
+        self._inflight = {}
+        self._cache_lock = threading.Lock()
+    
+    @property
+    def templates(self) -> List[Dict[str, Any]]:
+        """Templates currently loaded by the template tools."""
+        return self.template_tools.templates
+    
+    @property
+    def templates_by_type(self) -> Dict[Optional[str], List[Dict[str, Any]]]:
+        """Templates grouped by query type, kept current by the template tools on reload."""
+        return self.template_tools.templates_by_type
+    
+    @property
+    def agent(self):
+        """AutoGen assistant used for LLM-based construction, created on first access."""
+        if self._agent is None:
+            import autogen
+
+            # Get configuration for agent
+            agent_config = get_agent_config("sparql_construction")
+            
+            # Initialize the agent with AutoGen
+            self._agent = autogen.AssistantAgent(
+                name=agent_config["name"],
+                system_message=agent_config["system_message"],
+                llm_config=agent_config["llm_config"]
+            )
+        return self._agent
+    
+    @property
+    def proxy(self):
+        """AutoGen proxy used to talk to the assistant, created on first access."""
+        if self._proxy is None:
+            import autogen
+
+            # Initialize proxy agent for interaction
+            self._proxy = autogen.UserProxyAgent(
+                name="SPARQLConstructionProxy",
+                human_input_mode="NEVER",
+                is_termination_msg=lambda x: True,  # Always terminate after one response
+            )
+        return self._proxy
     
     def construct_query(
         self, 
@@ -66,6 +137,81 @@ class SPARQLConstructionAgent:
         Returns:
             Dictionary containing the SPARQL query and metadata
         """
+        cache_key = self._cache_key(refined_query, mapped_entities, query_type)
+        with self._cache_lock:
+            cached = self.query_cache.get(cache_key)
+            if cached is not None:
+                self.query_cache.move_to_end(cache_key)
+            else:
+                inflight = self._inflight.get(cache_key)
+                if inflight is None:
+                    inflight = self._inflight[cache_key] = (threading.Event(), [])
+                    is_leader = True
+                else:
+                    is_leader = False
+        
+        # Cached results are private copies, so callers can't mutate them through what they get back
+        if cached is not None:
+            return copy.deepcopy(cached)
+        
+        done, outcome = inflight
+        if not is_leader:
+            # Another thread is building the same query; reuse its result
+            done.wait()
+            if outcome:
+                return copy.deepcopy(outcome[0])
+            return self._build_query(refined_query, mapped_entities, query_type)
+        
+        try:
+            result = self._build_query(refined_query, mapped_entities, query_type)
+            
+            # Detach the shared copy from the caller's mapped_entities, which the result references
+            snapshot = copy.deepcopy(result)
+            outcome.append(snapshot)
+            
+            # Only cache queries that were actually produced
+            if snapshot.get("sparql"):
+                # Requests that resolve to the same query share one cached string
+                snapshot["sparql"] = sys.intern(snapshot["sparql"])
+                with self._cache_lock:
+                    self.query_cache[cache_key] = snapshot
+                    if len(self.query_cache) > self.cache_size:
+                        self.query_cache.popitem(last=False)
+            return result
+        finally:
+            with self._cache_lock:
+                self._inflight.pop(cache_key, None)
+            done.set()
+    
+    async def construct_query_async(
+        self, 
+        refined_query: str,
+        mapped_entities: Dict[str, List[Dict[str, Any]]],
+        query_type: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Construct a SPARQL query without blocking the running event loop.
+        
+        The LLM round-trip runs in a worker thread; caching and coalescing of
+        duplicate requests behave exactly as in construct_query.
+        
+        Args:
+            refined_query: The refined user query
+            mapped_entities: Dictionary of entities mapped to ontology terms
+            query_type: Optional explicit query type (SELECT, ASK, CONSTRUCT, DESCRIBE)
+            
+        Returns:
+            Dictionary containing the SPARQL query and metadata
+        """
+        return await asyncio.to_thread(self.construct_query, refined_query, mapped_entities, query_type)
+    
+    def _build_query(
+        self, 
+        refined_query: str,
+        mapped_entities: Dict[str, List[Dict[str, Any]]],
+        query_type: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Construct a SPARQL query from templates, falling back to the LLM."""
         # Determine query type if not provided
         if not query_type:
             query_type = self._determine_query_type(refined_query, mapped_entities)
@@ -95,30 +241,29 @@ class SPARQLConstructionAgent:
         # If no template found or template filling failed, use LLM
         return self._llm_based_construction(refined_query, mapped_entities, query_type)
     
-    def _load_templates(self) -> List[Dict[str, Any]]:
-        """Load SPARQL query templates from the templates directory."""
-        templates = []
-        
-        # Create templates directory if it doesn't exist
-        if not os.path.exists(self.templates_dir):
-            os.makedirs(self.templates_dir)
-            self._create_example_templates()
+    def _cache_key(
+        self, 
+        refined_query: str,
+        mapped_entities: Dict[str, List[Dict[str, Any]]],
+        query_type: Optional[str]
+    ) -> bytes:
+        """
+        Build a stable cache key for a construction request.
         
-        # Load all JSON files in the templates directory
-        try:
-            for filename in os.listdir(self.templates_dir):
-                if filename.endswith(".json"):
-                    with open(os.path.join(self.templates_dir, filename), "r") as f:
-                        template_data = json.load(f)
-                        
-                        # Add the template if it has the required fields
-                        if "id" in template_data and "pattern" in template_data:
-                            templates.append(template_data)
-        except Exception as e:
-            print(f"Error loading templates: {e}")
-        
-        print(f"Loaded {len(templates)} SPARQL query templates")
-        return templates
+        The question and entities are keyed verbatim, since both reach the LLM prompt or the
+        filled template as-is; only dictionary ordering is normalized.
+        """
+        payload = orjson.dumps(
+            [refined_query, mapped_entities, query_type],
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+            default=str
+        )
+        return hashlib.blake2b(payload, digest_size=16).digest()
+    
+    def clear_cache(self):
+        """Clear the constructed query cache."""
+        with self._cache_lock:
+            self.query_cache.clear()
     
     def _create_example_templates(self):
         """Create example SPARQL query templates."""
@@ -283,8 +428,8 @@ class SPARQLConstructionAgent:
         Returns:
             The best matching template or None if no suitable template found
         """
-        # Filter templates by query type
-        candidates = [t for t in self.templates if t.get("query_type") == query_type]
+        # Templates of the requested query type
+        candidates = self.templates_by_type.get(query_type)
         
         if not candidates:
             return None
@@ -308,20 +453,16 @@ class SPARQLConstructionAgent:
             return None
         
         # Score remaining templates by keyword matching
-        scored_candidates = []
         query_lower = query.lower()
+        scored_candidates = [
+            (template, sum(1 for keyword in template.get("keywords", []) if keyword in query_lower))
+            for template in valid_candidates
+        ]
         
-        for template in valid_candidates:
-            keywords = template.get("keywords", [])
-            score = sum(1 for keyword in keywords if keyword in query_lower)
-            scored_candidates.append((template, score))
-        
-        # Sort by score
-        scored_candidates.sort(key=lambda x: x[1], reverse=True)
-        
-        # Return the highest scoring template if it has a positive score
-        if scored_candidates and scored_candidates[0][1] > 0:
-            return scored_candidates[0][0]
+        # Return the highest scoring template (first one on ties) if it has a positive score
+        best_template, best_score = max(scored_candidates, key=lambda x: x[1])
+        if best_score > 0:
+            return best_template
         
         # If no good match by keywords, return the first valid template
         if valid_candidates:
@@ -534,11 +675,6 @@ class SPARQLConstructionAgent:
             for entity in mapped_entities["literals"]:
                 entities_str += f"- {entity['text']} (Type: {entity.get('inferred_type', 'unspecified')})\n"
         
-        # Format common prefixes
-        prefixes_str = "\nCommon prefixes:\n"
-        for prefix, uri in self.common_prefixes.items():
-            prefixes_str += f"PREFIX {prefix}: <{uri}>\n"
-        
         # Prepare the prompt for the LLM
         prompt = f"""
 I need you to construct a valid SPARQL query based on a natural language question.
@@ -552,7 +688,7 @@ SPARQL Query Type:
 Mapped Ontology Entities:
 {entities_str}
 
-{prefixes_str}
+{self._prefixes_prompt}
 
 Please create a SPARQL query that:
 1. Uses the correct query form ({query_type})
@@ -573,7 +709,6 @@ Return only the complete SPARQL query with prefixes.
         response_text = response.summary.strip()
         
         # Extract the SPARQL query (ignore explanation text)
-        import re
         sparql_pattern = re.compile(r'(?:```(?:sparql)?\s*)?(.+?)(?:\s*```)?$', re.DOTALL)
         match = sparql_pattern.search(response_text)
         
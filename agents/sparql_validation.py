@@ -1,10 +1,45 @@
-import json
+import asyncio
+import copy
+import hashlib
 import re
-from typing import Any, Dict, List, Optional
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional
 
 import autogen
+import orjson
 
 from config.agent_config import get_agent_config
+from tools.sparql_tools import SPARQLTools
+
+# Patterns used by the local syntax check, compiled once at import
+_QUERY_FORM_PATTERN = re.compile(r'\b(SELECT|ASK|CONSTRUCT|DESCRIBE)\b', re.IGNORECASE)
+_QUERY_START_PATTERN = re.compile(
+    r'(?:\s|#[^\n]*|BASE\s*<[^>]*>|PREFIX\s+[^\s:<]*:\s*<[^>]*>)*(SELECT|ASK|CONSTRUCT|DESCRIBE)\b',
+    re.IGNORECASE
+)
+_PREFIX_PATTERN = re.compile(r'PREFIX\s+([^:]+):\s*<([^>]+)>', re.IGNORECASE)
+_HTTP_URI_PATTERN = re.compile(r'^https?://')
+_WHERE_SECTION_PATTERN = re.compile(r'WHERE\s*{([^}]+)}', re.IGNORECASE | re.DOTALL)
+_FILTER_PATTERN = re.compile(r'FILTER\s*\([^)]+\)', re.IGNORECASE)
+_OPTIONAL_PATTERN = re.compile(r'OPTIONAL\s*{[^}]+}', re.IGNORECASE)
+_JSON_BLOCK_PATTERN = re.compile(r'```(?:json)?\s*({.+?})\s*```', re.DOTALL)
+_JSON_OBJECT_PATTERN = re.compile(r'({.+})', re.DOTALL)
+
+
+def _syntax_result(is_valid: bool, feedback: str) -> Mapping[str, Any]:
+    """Build a read-only syntax validation result."""
+    return MappingProxyType({"is_valid": is_valid, "validation_type": "syntax", "feedback": feedback})
+
+
+# Syntax check outcomes whose feedback never varies
+_EMPTY_QUERY = _syntax_result(False, "Query is empty")
+_UNBALANCED_BRACES = _syntax_result(False, "Unbalanced braces in query")
+_MISSING_QUERY_FORM = _syntax_result(False, "Missing query form (SELECT, ASK, CONSTRUCT, DESCRIBE)")
+_UNRECOGNIZED_START = _syntax_result(False, "Query does not start with a recognized SPARQL form")
+_MISSING_WHERE = _syntax_result(False, "Missing WHERE clause")
+_SYNTAX_PASSED = _syntax_result(True, "Basic syntax check passed")
 
 
 class SPARQLValidationAgent:
@@ -13,8 +48,15 @@ class SPARQLValidationAgent:
     Checks syntax, semantics, and detects potential issues.
     """
     
-    def __init__(self):
-        """Initialize the SPARQL validation agent."""
+    __slots__ = ("agent", "proxy", "validation_cache", "cache_size", "cache_hits", "cache_misses", "_cache_lock")
+    
+    def __init__(self, cache_size: int = 4096):
+        """
+        Initialize the SPARQL validation agent.
+        
+        Args:
+            cache_size: Maximum number of LLM validation results to keep in the LRU cache
+        """
         # Get configuration for agent
         agent_config = get_agent_config("sparql_validation")
         
@@ -31,18 +73,27 @@ class SPARQLValidationAgent:
             human_input_mode="NEVER",
             is_termination_msg=lambda x: True,  # Always terminate after one response
         )
+        
+        # LRU cache of LLM validation results keyed by a hash of the query and its metadata
+        self.validation_cache = OrderedDict()
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache_lock = threading.Lock()
     
     def validate_query(
         self, 
         sparql_query: str, 
-        query_metadata: Dict[str, Any]
-    ) -> Dict[str, Any]:
+        query_metadata: Dict[str, Any],
+        use_cache: bool = True
+    ) -> Mapping[str, Any]:
         """
         Validate a SPARQL query.
         
         Args:
             sparql_query: The SPARQL query to validate
             query_metadata: Metadata about the query
+            use_cache: Whether to read and store the LLM verdict in the validation cache
             
         Returns:
             Validation result with is_valid flag and feedback
@@ -53,10 +104,59 @@ class SPARQLValidationAgent:
         if not syntax_result["is_valid"]:
             return syntax_result
         
-        # Check semantic validity using LLM
-        return self._llm_based_validation(sparql_query, query_metadata)
+        # Check semantic validity using LLM, reusing earlier verdicts for the same query;
+        # without a cache key the verdict is neither read from nor written to the cache
+        cache_key = None
+        if use_cache:
+            cache_key = self._cache_key(sparql_query, query_metadata)
+            with self._cache_lock:
+                cached = self.validation_cache.get(cache_key)
+                if cached is not None:
+                    self.validation_cache.move_to_end(cache_key)
+                    self.cache_hits += 1
+                    return copy.deepcopy(cached)
+                self.cache_misses += 1
+        return self._llm_based_validation(sparql_query, query_metadata, cache_key)
+    
+    async def validate_query_async(
+        self, 
+        sparql_query: str, 
+        query_metadata: Dict[str, Any],
+        use_cache: bool = True
+    ) -> Mapping[str, Any]:
+        """
+        Validate a SPARQL query without blocking the running event loop.
+        
+        Args:
+            sparql_query: The SPARQL query to validate
+            query_metadata: Metadata about the query
+            use_cache: Whether to read and store the LLM verdict in the validation cache
+            
+        Returns:
+            Validation result with is_valid flag and feedback
+        """
+        return await asyncio.to_thread(self.validate_query, sparql_query, query_metadata, use_cache)
+    
+    def _cache_key(self, sparql_query: str, query_metadata: Dict[str, Any]) -> bytes:
+        """Build a cache key from the normalized query and the metadata that goes into the LLM prompt."""
+        payload = orjson.dumps(
+            [
+                SPARQLTools.normalize_query(sparql_query),
+                query_metadata.get("query_type"),
+                query_metadata.get("template_based", False),
+                query_metadata.get("entities_used", {})
+            ],
+            option=orjson.OPT_SORT_KEYS,
+            default=str
+        )
+        return hashlib.blake2b(payload, digest_size=16).digest()
+    
+    def clear_cache(self):
+        """Clear the validation result cache, e.g. after the ontology changes."""
+        with self._cache_lock:
+            self.validation_cache.clear()
     
-    def _check_syntax(self, sparql_query: str) -> Dict[str, Any]:
+    def _check_syntax(self, sparql_query: str) -> Mapping[str, Any]:
         """
         Perform basic syntax checks on SPARQL query.
         
@@ -67,40 +167,24 @@ class SPARQLValidationAgent:
             Validation result dictionary
         """
         # Check for empty query
-        if not sparql_query or sparql_query.strip() == "":
-            return {
-                "is_valid": False,
-                "validation_type": "syntax",
-                "feedback": "Query is empty"
-            }
+        if not sparql_query or sparql_query.isspace():
+            return _EMPTY_QUERY
         
         # Check for balanced braces
         if sparql_query.count("{") != sparql_query.count("}"):
-            return {
-                "is_valid": False,
-                "validation_type": "syntax",
-                "feedback": "Unbalanced braces in query"
-            }
+            return _UNBALANCED_BRACES
         
-        # Check for proper query form (SELECT, ASK, CONSTRUCT, DESCRIBE)
-        query_form_match = re.search(r'\b(SELECT|ASK|CONSTRUCT|DESCRIBE)\b', sparql_query, re.IGNORECASE)
+        # Check for proper query form (SELECT, ASK, CONSTRUCT, DESCRIBE), preceded only by the prologue
+        query_form_match = _QUERY_START_PATTERN.match(sparql_query)
         if not query_form_match:
-            return {
-                "is_valid": False,
-                "validation_type": "syntax",
-                "feedback": "Missing query form (SELECT, ASK, CONSTRUCT, DESCRIBE)"
-            }
+            return _UNRECOGNIZED_START if _QUERY_FORM_PATTERN.search(sparql_query) else _MISSING_QUERY_FORM
         
         # Check for WHERE clause (except for ASK queries where it's optional)
         if query_form_match.group(1).upper() != "ASK" and "WHERE" not in sparql_query.upper():
-            return {
-                "is_valid": False,
-                "validation_type": "syntax",
-                "feedback": "Missing WHERE clause"
-            }
+            return _MISSING_WHERE
         
         # Check for proper PREFIX definitions
-        prefix_matches = re.findall(r'PREFIX\s+([^:]+):\s*<([^>]+)>', sparql_query, re.IGNORECASE)
+        prefix_matches = _PREFIX_PATTERN.findall(sparql_query)
         
         for prefix, uri in prefix_matches:
             # Check if prefix is valid
@@ -112,7 +196,7 @@ class SPARQLValidationAgent:
                 }
             
             # Check if URI is valid
-            if not uri or not re.match(r'^https?://', uri):
+            if not uri or not _HTTP_URI_PATTERN.match(uri):
                 return {
                     "is_valid": False,
                     "validation_type": "syntax",
@@ -121,23 +205,25 @@ class SPARQLValidationAgent:
         
         # Check if all triple patterns have subject, predicate, and object
         # This is a basic check; a full parser would be more accurate
-        where_section_match = re.search(r'WHERE\s*{([^}]+)}', sparql_query, re.IGNORECASE | re.DOTALL)
+        where_section_match = _WHERE_SECTION_PATTERN.search(sparql_query)
         
         if where_section_match:
             where_section = where_section_match.group(1)
             
             # Remove FILTER, OPTIONAL, and other complex patterns for simple validation
-            simplified_section = re.sub(r'FILTER\s*\([^)]+\)', '', where_section, flags=re.IGNORECASE)
-            simplified_section = re.sub(r'OPTIONAL\s*{[^}]+}', '', simplified_section, flags=re.IGNORECASE)
+            simplified_section = _FILTER_PATTERN.sub('', where_section)
+            simplified_section = _OPTIONAL_PATTERN.sub('', simplified_section)
             
             # Split into triples (simple approach, not perfect)
-            triple_patterns = [t.strip() for t in simplified_section.split('.') if t.strip()]
-            
-            for pattern in triple_patterns:
-                parts = [p.strip() for p in pattern.split() if p.strip()]
+            for pattern in simplified_section.split('.'):
+                # str.split() already drops surrounding whitespace and empty parts
+                parts = pattern.split()
+                if not parts:
+                    continue
                 
                 # Expect at least subject, predicate, object
                 if len(parts) < 3:
+                    pattern = pattern.strip()
                     return {
                         "is_valid": False,
                         "validation_type": "syntax",
@@ -145,19 +231,21 @@ class SPARQLValidationAgent:
                     }
         
         # If we get here, the basic syntax checks pass
-        return {
-            "is_valid": True,
-            "validation_type": "syntax",
-            "feedback": "Basic syntax check passed"
-        }
+        return _SYNTAX_PASSED
     
-    def _llm_based_validation(self, sparql_query: str, query_metadata: Dict[str, Any]) -> Dict[str, Any]:
+    def _llm_based_validation(
+        self, 
+        sparql_query: str, 
+        query_metadata: Dict[str, Any],
+        cache_key: Optional[bytes] = None
+    ) -> Dict[str, Any]:
         """
         Use LLM to validate SPARQL query semantics.
         
         Args:
             sparql_query: The SPARQL query to validate
             query_metadata: Metadata about the query
+            cache_key: Key under which a successfully parsed result is cached
             
         Returns:
             Validation result dictionary
@@ -224,18 +312,19 @@ Return your validation result in the following JSON format:
         # Parse the JSON result
         try:
             # Find JSON content in response
-            import re
-            json_match = re.search(r'```(?:json)?\s*({.+?})\s*```', response_text, re.DOTALL)
+            json_match = _JSON_BLOCK_PATTERN.search(response_text)
             
             if json_match:
                 json_str = json_match.group(1)
-                validation_result = json.loads(json_str)
+                validation_result = orjson.loads(json_str)
+                self._cache_result(cache_key, validation_result)
             else:
                 # Try to find JSON without the code block
-                json_match = re.search(r'({.+})', response_text, re.DOTALL)
+                json_match = _JSON_OBJECT_PATTERN.search(response_text)
                 if json_match:
                     json_str = json_match.group(1)
-                    validation_result = json.loads(json_str)
+                    validation_result = orjson.loads(json_str)
+                    self._cache_result(cache_key, validation_result)
                 else:
                     # Fallback if no JSON found
                     validation_result = {
@@ -252,3 +341,12 @@ Return your validation result in the following JSON format:
             }
         
         return validation_result
+    
+    def _cache_result(self, cache_key: Optional[bytes], validation_result: Dict[str, Any]):
+        """Store a parsed LLM validation result; parsing failures are never cached."""
+        if cache_key is None:
+            return
+        with self._cache_lock:
+            self.validation_cache[cache_key] = copy.deepcopy(validation_result)
+            if len(self.validation_cache) > self.cache_size:
+                self.validation_cache.popitem(last=False)
@@ -10,11 +10,14 @@ class ToolExecutionAgent:
     with the original blockchain project's Master-Slave pattern.
     """
     
+    __slots__ = ("query_executor",)
+    
     def __init__(
         self, 
         endpoint_url: Optional[str] = None,
         auth_token: Optional[str] = None,
-        default_graph: Optional[str] = None
+        default_graph: Optional[str] = None,
+        query_executor: Optional[QueryExecutionAgent] = None
     ):
         """
         Initialize the tool execution agent.
@@ -23,9 +26,10 @@ class ToolExecutionAgent:
             endpoint_url: URL of the SPARQL endpoint
             auth_token: Authentication token for the endpoint
             default_graph: Default graph URI
+            query_executor: Existing query execution agent to share instead of creating one
         """
-        # Initialize the underlying query execution agent
-        self.query_executor = QueryExecutionAgent(
+        # Initialize the underlying query execution agent, reusing a shared one when given
+        self.query_executor = query_executor or QueryExecutionAgent(
             endpoint_url=endpoint_url,
             auth_token=auth_token,
             default_graph=default_graph
@@ -1,8 +1,8 @@
-import json
 import re
 from typing import Any, Dict, List
 
 import autogen
+import orjson
 
 from config.agent_config import get_agent_config
 
@@ -153,7 +153,7 @@ class ValidationAgent:
         # Format the mapped entities if available
         entities_text = ""
         if "mapped_entities" in query_context:
-            entities_text = json.dumps(query_context["mapped_entities"], indent=2)
+            entities_text = orjson.dumps(query_context["mapped_entities"], option=orjson.OPT_INDENT_2, default=str).decode()
         else:
             entities_text = "No mapped entities available."
         
@@ -207,12 +207,12 @@ Return your validation result in the following JSON format:
         # Format the mapped entities if available
         entities_text = ""
         if "mapped_entities" in query_context:
-            entities_text = json.dumps(query_context["mapped_entities"], indent=2)
+            entities_text = orjson.dumps(query_context["mapped_entities"], option=orjson.OPT_INDENT_2, default=str).decode()
         else:
             entities_text = "No mapped entities available."
         
         # Format the plan steps
-        steps_text = json.dumps(steps, indent=2)
+        steps_text = orjson.dumps(steps, option=orjson.OPT_INDENT_2, default=str).decode()
         
         # Construct the prompt
         prompt = f"""I need you to validate an execution plan for answering a SPARQL query.
@@ -266,13 +266,13 @@ Return your validation result in the following JSON format:
             
             if json_match:
                 json_str = json_match.group(1)
-                validation_result = json.loads(json_str)
+                validation_result = orjson.loads(json_str)
             else:
                 # Try to find JSON without the code block
                 json_match = re.search(r'({.*"is_valid".*})', response_text, re.DOTALL)
                 if json_match:
                     json_str = json_match.group(1)
-                    validation_result = json.loads(json_str)
+                    validation_result = orjson.loads(json_str)
                 else:
                     # Fallback if no JSON found
                     validation_result = {
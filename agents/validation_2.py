@@ -5,7 +5,7 @@ from langchain.output_parsers import ResponseSchema
 from langchain.output_parsers import StructuredOutputParser
 from database.qdrant_client import QdrantClient
 from typing import List, Dict, Any, Optional
-import json
+import orjson
 
 class ValidationAgent:
     """
@@ -51,7 +51,7 @@ class ValidationAgent:
                 plan = execution_plan.get("steps", [])
                 prompt = self._prepare_validation_prompt(query_context["user_query"], plan)
                 validation_ans = self.agent.invoke(prompt)
-                validation_ans = json.loads(validation_ans.content)
+                validation_ans = orjson.loads(validation_ans.content)
                 break
             except Exception as e:
                 print(e, validation_ans.content)
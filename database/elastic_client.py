@@ -67,7 +67,7 @@ class ElasticClient:
             )
             return response.get("acknowledged", False)
         except Exception as e:
-            logger.error(f"Error creating index: {e}")
+            logger.error("Error creating index: %s", e)
             return False
     
     def index_ontology_class(self, class_data: Dict[str, Any]) -> bool:
@@ -110,7 +110,7 @@ class ElasticClient:
             )
             return response.get("result") in ["created", "updated"]
         except Exception as e:
-            logger.error(f"Error indexing ontology class: {e}")
+            logger.error("Error indexing ontology class: %s", e)
             return False
     
     def index_ontology_property(self, property_data: Dict[str, Any]) -> bool:
@@ -153,7 +153,7 @@ class ElasticClient:
             )
             return response.get("result") in ["created", "updated"]
         except Exception as e:
-            logger.error(f"Error indexing ontology property: {e}")
+            logger.error("Error indexing ontology property: %s", e)
             return False
     
     def index_ontology_instance(self, instance_data: Dict[str, Any]) -> bool:
@@ -190,7 +190,7 @@ class ElasticClient:
             )
             return response.get("result") in ["created", "updated"]
         except Exception as e:
-            logger.error(f"Error indexing ontology instance: {e}")
+            logger.error("Error indexing ontology instance: %s", e)
             return False
     
     def bulk_index_ontology(
@@ -265,13 +265,13 @@ class ElasticClient:
             success = not response.get("errors", True)
             
             if success:
-                logger.info(f"Bulk indexed {len(classes)} classes, {len(properties)} properties, and {len(instances)} instances")
+                logger.info("Bulk indexed %d classes, %d properties, and %d instances", len(classes), len(properties), len(instances))
             else:
-                logger.error(f"Errors in bulk indexing: {response.get('items', [])}")
+                logger.error("Errors in bulk indexing: %s", response.get('items', []))
             
             return success
         except Exception as e:
-            logger.error(f"Error bulk indexing ontology: {e}")
+            logger.error("Error bulk indexing ontology: %s", e)
             return False
     
     def search_ontology_term(
@@ -383,7 +383,7 @@ class ElasticClient:
             
             return results
         except Exception as e:
-            logger.error(f"Error searching for ontology term: {e}")
+            logger.error("Error searching for ontology term: %s", e)
             return []
     
     def initialize_indices(self) -> bool:
@@ -466,12 +466,12 @@ class ElasticClient:
             success = True
             for index_name, mappings in index_mappings.items():
                 if not self.index_exists(index_name):
-                    logger.info(f"Creating index: {index_name}")
+                    logger.info("Creating index: %s", index_name)
                     success = success and self.create_index(index_name, mappings)
                     
             return success
         except Exception as e:
-            logger.error(f"Error initializing indices: {e}")
+            logger.error("Error initializing indices: %s", e)
             return False
     
     def index_exists(self, index_name: str) -> bool:
@@ -487,5 +487,5 @@ class ElasticClient:
         try:
             return self.client.indices.exists(index=index_name)
         except Exception as e:
-            logger.error(f"Error checking index: {e}")
+            logger.error("Error checking index: %s", e)
             return False
@@ -1,6 +1,9 @@
+import copy
 import logging
 import os
 import re
+import threading
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional, Tuple
 
 import pandas as pd
@@ -20,7 +23,8 @@ class OntologyStore:
         self, 
         local_path: Optional[str] = None,
         endpoint_url: Optional[str] = None,
-        prefixes: Optional[Dict[str, str]] = None
+        prefixes: Optional[Dict[str, str]] = None,
+        search_cache_size: int = 1024
     ):
         """
         Initialize the ontology store.
@@ -29,14 +33,17 @@ class OntologyStore:
             local_path: Path to local ontology file (RDF/OWL/TTL)
             endpoint_url: URL of SPARQL endpoint for remote ontology
             prefixes: Dictionary of namespace prefixes
+            search_cache_size: Maximum number of term searches to keep in the LRU cache
         """
         self.local_path = local_path
         # Default to the GraphDB container endpoint if no endpoint is provided.
         self.endpoint_url = endpoint_url if endpoint_url else "http://localhost:7200/repositories/CHeVIE"
         
-        # Initialize SPARQL wrapper for GraphDB
+        # Initialize SPARQL wrapper for GraphDB; other threads get their own via _get_sparql
         self.sparql = SPARQLWrapper(self.endpoint_url)
         self.sparql.setReturnFormat(JSON)
+        self._local = threading.local()
+        self._local.sparql = self.sparql
         
         # Initialize RDF graph for local file
         self.graph = Graph()
@@ -65,6 +72,11 @@ class OntologyStore:
             "property_count": 0,
             "instance_count": 0
         }
+        
+        # LRU cache of term search results, valid until the ontology is reloaded
+        self._search_cache = OrderedDict()
+        self.search_cache_size = search_cache_size
+        self._search_cache_lock = threading.Lock()
     
     def load_ontology(self) -> bool:
         """
@@ -74,16 +86,18 @@ class OntologyStore:
             True if successful, False otherwise
         """
         success = False
+        self.clear_search_cache()
         
         # Try loading from endpoint first
         try:
             # Test connection to GraphDB
-            logger.info(f"Testing connection to GraphDB: {self.endpoint_url}")
+            logger.info("Testing connection to GraphDB: %s", self.endpoint_url)
             
             # Simple query to check connection
             test_query = "ASK { ?s ?p ?o }"
-            self.sparql.setQuery(test_query)
-            results = self.sparql.query().convert()
+            sparql = self._get_sparql()
+            sparql.setQuery(test_query)
+            results = sparql.query().convert()
             
             if results.get('boolean', False):
                 logger.info("Successfully connected to GraphDB")
@@ -98,7 +112,7 @@ class OntologyStore:
             else:
                 logger.warning("Connected to GraphDB but repository might be empty")
         except Exception as e:
-            logger.error(f"Error connecting to GraphDB: {e}")
+            logger.error("Error connecting to GraphDB: %s", e)
         
         # If GraphDB loading failed, try loading from local file
         if not success and self.local_path and os.path.exists(self.local_path):
@@ -107,7 +121,7 @@ class OntologyStore:
         # If either loading method was successful, build indices
         if success:
             self._update_stats()
-            logger.info(f"Loaded ontology with {self.stats['total_triples']} triples")
+            logger.info("Loaded ontology with %s triples", self.stats['total_triples'])
             return True
         
         logger.warning("Failed to load ontology from any source")
@@ -121,72 +135,68 @@ class OntologyStore:
             True if successful, False otherwise
         """
         try:
-            logger.info(f"Loading ontology from file: {self.local_path}")
+            logger.info("Loading ontology from file: %s", self.local_path)
             self.graph.parse(self.local_path)
             return len(self.graph) > 0
         except Exception as e:
-            logger.error(f"Error loading ontology from file: {e}")
+            logger.error("Error loading ontology from file: %s", e)
             return False
     
     def _load_basic_stats(self):
         """Load basic statistics about the ontology from GraphDB."""
         try:
-            # Get total triple count
-            query = "SELECT (COUNT(*) AS ?count) WHERE { ?s ?p ?o }"
-            results_df = self._query_graphdb(query)
-            
-            if not results_df.empty:
-                self.stats["total_triples"] = int(results_df["count"].iloc[0])
-            
-            # Get class count
+            # Fetch all counts in a single round trip; each sub-select yields one row
             query = """
-            SELECT (COUNT(DISTINCT ?class) AS ?count) 
-            WHERE { 
-                { ?class a owl:Class } 
-                UNION 
-                { ?class a rdfs:Class }
-            }
-            """
-            results_df = self._query_graphdb(query)
-            
-            if not results_df.empty:
-                self.stats["class_count"] = int(results_df["count"].iloc[0])
-            
-            # Get property count
-            query = """
-            SELECT (COUNT(DISTINCT ?prop) AS ?count) 
-            WHERE { 
-                { ?prop a rdf:Property } 
-                UNION 
-                { ?prop a owl:ObjectProperty }
-                UNION 
-                { ?prop a owl:DatatypeProperty }
-            }
-            """
-            results_df = self._query_graphdb(query)
-            
-            if not results_df.empty:
-                self.stats["property_count"] = int(results_df["count"].iloc[0])
-            
-            # Estimate instance count
-            query = """
-            SELECT (COUNT(DISTINCT ?instance) AS ?count) 
-            WHERE { 
-                ?instance a ?type .
-                ?type a owl:Class .
-                FILTER(?type != owl:Class && ?type != rdfs:Class)
+            SELECT ?total_triples ?class_count ?property_count ?instance_count
+            WHERE {
+                {
+                    SELECT (COUNT(*) AS ?total_triples)
+                    WHERE { ?s ?p ?o }
+                }
+                {
+                    SELECT (COUNT(DISTINCT ?class) AS ?class_count) 
+                    WHERE { 
+                        { ?class a owl:Class } 
+                        UNION 
+                        { ?class a rdfs:Class }
+                    }
+                }
+                {
+                    SELECT (COUNT(DISTINCT ?prop) AS ?property_count) 
+                    WHERE { 
+                        { ?prop a rdf:Property } 
+                        UNION 
+                        { ?prop a owl:ObjectProperty }
+                        UNION 
+                        { ?prop a owl:DatatypeProperty }
+                    }
+                }
+                {
+                    SELECT (COUNT(DISTINCT ?instance) AS ?instance_count) 
+                    WHERE { 
+                        ?instance a ?type .
+                        ?type a owl:Class .
+                        FILTER(?type != owl:Class && ?type != rdfs:Class)
+                    }
+                }
             }
-            LIMIT 1
             """
             results_df = self._query_graphdb(query)
             
             if not results_df.empty:
-                self.stats["instance_count"] = int(results_df["count"].iloc[0])
+                row = results_df.iloc[0]
+                for key in ("total_triples", "class_count", "property_count", "instance_count"):
+                    # A missing or unparsable count must not discard the others
+                    value = row.get(key)
+                    try:
+                        self.stats[key] = int(value) if pd.notna(value) else 0
+                    except (TypeError, ValueError):
+                        self.stats[key] = 0
                 
-            logger.info(f"Loaded ontology stats: {self.stats}")
+            logger.info("Loaded ontology stats: %s", self.stats)
             
         except Exception as e:
-            logger.error(f"Error loading basic stats: {e}")
+            logger.error("Error loading basic stats: %s", e)
     
     def _build_indices(self):
         """Build indices for faster access to ontology elements."""
@@ -399,6 +409,14 @@ class OntologyStore:
         self.stats["property_count"] = len(self.properties)
         self.stats["instance_count"] = len(self.instances)
     
+    def _get_sparql(self) -> SPARQLWrapper:
+        """Get the SPARQL wrapper of the calling thread, since wrappers hold per-query state."""
+        sparql = getattr(self._local, "sparql", None)
+        if sparql is None:
+            sparql = self._local.sparql = SPARQLWrapper(self.endpoint_url)
+            sparql.setReturnFormat(JSON)
+        return sparql
+    
     def _query_graphdb(self, query: str) -> pd.DataFrame:
         """
         Execute a SPARQL query against GraphDB and return results as a DataFrame.
@@ -416,10 +434,11 @@ class OntologyStore:
                 prefix_str += f"PREFIX {prefix}: <{uri}>\n"
             query = prefix_str + query
         
-        self.sparql.setQuery(query)
+        sparql = self._get_sparql()
+        sparql.setQuery(query)
         
         try:
-            results = self.sparql.query().convert()
+            results = sparql.query().convert()
             
             # Process results
             variables = results['head']['vars']
@@ -439,7 +458,7 @@ class OntologyStore:
             return pd.DataFrame(rows)
             
         except Exception as e:
-            logger.error(f"Error executing query: {e}")
+            logger.error("Error executing query: %s", e)
             return pd.DataFrame()  # Return empty DataFrame on error
     
     def search_classes(
@@ -459,6 +478,12 @@ class OntologyStore:
         Returns:
             List of matching classes with similarity scores
         """
+        # Searches are case-insensitive, so the lowercased query is a complete key
+        cache_key = ("classes", query.lower(), limit, threshold)
+        cached = self._get_cached_search(cache_key)
+        if cached is not None:
+            return cached
+        
         # Query GraphDB directly
         sparql_query = f"""
         PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
@@ -504,6 +529,7 @@ class OntologyStore:
                     "subclasses": []
                 })
         
+        self._cache_search(cache_key, results)
         return results
     
     def search_properties(
@@ -523,6 +549,11 @@ class OntologyStore:
         Returns:
             List of matching properties with similarity scores
         """
+        cache_key = ("properties", query.lower(), limit, threshold)
+        cached = self._get_cached_search(cache_key)
+        if cached is not None:
+            return cached
+        
         # Query GraphDB directly
         sparql_query = f"""
         PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
@@ -578,6 +609,7 @@ class OntologyStore:
                     "ranges": []
                 })
         
+        self._cache_search(cache_key, results)
         return results
     
     def search_instances(
@@ -597,6 +629,11 @@ class OntologyStore:
         Returns:
             List of matching instances with similarity scores
         """
+        cache_key = ("instances", query.lower(), limit, threshold)
+        cached = self._get_cached_search(cache_key)
+        if cached is not None:
+            return cached
+        
         # Query GraphDB directly
         sparql_query = f"""
         PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
@@ -640,8 +677,33 @@ class OntologyStore:
                     "similarity": similarity
                 })
         
+        self._cache_search(cache_key, results)
         return results
     
+    def _get_cached_search(self, cache_key: Tuple) -> Optional[List[Dict[str, Any]]]:
+        """Return a copy of the cached results for a search, if any."""
+        with self._search_cache_lock:
+            cached = self._search_cache.get(cache_key)
+            if cached is None:
+                return None
+            self._search_cache.move_to_end(cache_key)
+        # Callers annotate the returned matches, so never hand out the cached objects
+        return copy.deepcopy(cached)
+    
+    def _cache_search(self, cache_key: Tuple, results: List[Dict[str, Any]]):
+        """Cache the results of a search; empty results are not cached since failed queries also return none."""
+        if not results:
+            return
+        with self._search_cache_lock:
+            self._search_cache[cache_key] = copy.deepcopy(results)
+            if len(self._search_cache) > self.search_cache_size:
+                self._search_cache.popitem(last=False)
+    
+    def clear_search_cache(self):
+        """Clear the term search cache."""
+        with self._search_cache_lock:
+            self._search_cache.clear()
+    
     def _extract_name_from_uri(self, uri: str) -> str:
         """Extract a readable label from a URI."""
         if "#" in uri:
@@ -937,8 +999,9 @@ class OntologyStore:
             
             if query_upper.startswith("ASK"):
                 # ASK query
-                self.sparql.setQuery(query)
-                results = self.sparql.query().convert()
+                sparql = self._get_sparql()
+                sparql.setQuery(query)
+                results = sparql.query().convert()
                 
                 return {
                     "success": True,
@@ -983,8 +1046,9 @@ class OntologyStore:
             
             elif query_upper.startswith("CONSTRUCT") or query_upper.startswith("DESCRIBE"):
                 # For CONSTRUCT and DESCRIBE, just pass-through the results
-                self.sparql.setQuery(query)
-                results = self.sparql.query().convert()
+                sparql = self._get_sparql()
+                sparql.setQuery(query)
+                results = sparql.query().convert()
                 
                 return {
                     "success": True,
@@ -999,7 +1063,7 @@ class OntologyStore:
                 }
                 
         except Exception as e:
-            logger.error(f"Error executing SPARQL query: {e}")
+            logger.error("Error executing SPARQL query: %s", e)
             return {
                 "success": False,
                 "error": str(e)
@@ -1,6 +1,7 @@
 # database/qdrant_client.py
 import logging
 import os
+import threading
 from typing import Any, Dict, List, Optional
 
 from qdrant_client import QdrantClient as BaseQdrantClient
@@ -18,6 +19,10 @@ class QdrantClient:
     Client for Qdrant vector database operations.
     Handles vector search for SPARQL templates, examples, etc.
     """
+    # Embedding model shared by all instances, loaded on first construction
+    _default_model = None
+    _model_lock = threading.Lock()
+    
     def __init__(self, url: Optional[str] = None):
         """
         Initialize the Qdrant client.
@@ -26,13 +31,22 @@ class QdrantClient:
             url: URL of the Qdrant server, defaults to env var or localhost
         """
         self.url = url or os.getenv("QDRANT_URL", "http://localhost:6333")
-        self.default_model = SentenceTransformer("all-MiniLM-L6-v2")
+        self.default_model = self._load_default_model()
 
         # Initialize the base client
         self.client = BaseQdrantClient(url=self.url)
 
         # Default vector dimension for embedding models
         self.default_dim = 384
+    
+    @classmethod
+    def _load_default_model(cls) -> SentenceTransformer:
+        """Load the default embedding model once and reuse it across clients."""
+        if cls._default_model is None:
+            with cls._model_lock:
+                if cls._default_model is None:
+                    cls._default_model = SentenceTransformer("all-MiniLM-L6-v2")
+        return cls._default_model
 
     def create_collection(
         self, 
@@ -64,7 +78,7 @@ class QdrantClient:
             )
             return True
         except Exception as e:
-            logger.error(f"Error creating collection: {e}")
+            logger.error("Error creating collection: %s", e)
             return False
     
     def search(
@@ -132,7 +146,7 @@ class QdrantClient:
                 })
             return simplified_results
         except Exception as e:
-            logger.error(f"Error searching in collection: {e}")
+            logger.error("Error searching in collection: %s", e)
             return []
     
     def upsert_points(
@@ -160,7 +174,7 @@ class QdrantClient:
                 
                 # Skip if no vector
                 if not vector:
-                    logger.warning(f"Skipping point {point_id} - no vector provided")
+                    logger.warning("Skipping point %s - no vector provided", point_id)
                     continue
                     
                 # Add the point to batch
@@ -183,7 +197,7 @@ class QdrantClient:
                 logger.warning("No valid points to upsert")
                 return False
         except Exception as e:
-            logger.error(f"Error upserting points: {e}")
+            logger.error("Error upserting points: %s", e)
             return False
     
     def delete_points(self, collection_name: str, point_ids: List[str]) -> bool:
@@ -206,7 +220,7 @@ class QdrantClient:
             )
             return True
         except Exception as e:
-            logger.error(f"Error deleting points: {e}")
+            logger.error("Error deleting points: %s", e)
             return False
     
     def collection_exists(self, collection_name: str) -> bool:
@@ -226,5 +240,5 @@ class QdrantClient:
                     return True
             return False
         except Exception as e:
-            logger.error(f"Error checking collection: {e}")
+            logger.error("Error checking collection: %s", e)
             return False
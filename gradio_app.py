@@ -1,11 +1,12 @@
-import json
 import os
 
 import gradio as gr
+import orjson
 
-from agents.query_execution import QueryExecutionAgent
 from main import (initialize_agents, initialize_databases, initialize_models,
                   initialize_tools)
+from utils.constants import MAX_CONVERSATION_HISTORY
+from utils.history_utils import trim_history
 from utils.logging_utils import setup_logging
 
 logger = setup_logging(app_name="nl-to-sparql", enable_colors=True)
@@ -26,8 +27,8 @@ master_agent = initialize_agents(
     template_tools,
     sparql_tools
 )
-# Initialize the query execution agent to run SPARQL against GraphDB.
-query_execution_agent = QueryExecutionAgent(endpoint_url=GRAPHDB_ENDPOINT)
+# Reuse the master agent's query execution agent (and its result cache) to run SPARQL against GraphDB.
+query_execution_agent = master_agent.slave_agents["query_execution"]
 
 
 def process_gradio_query(user_query, conversation_history):
@@ -48,6 +49,8 @@ def process_gradio_query(user_query, conversation_history):
     # Update conversation history with the interaction.
     conversation_history.append({"role": "user", "content": user_query})
     conversation_history.append({"role": "assistant", "content": final_response})
+    # Keep the history bounded so long sessions don't grow memory and refinement work
+    trim_history(conversation_history, MAX_CONVERSATION_HISTORY)
     return intermediate_reasoning, final_response, generated_sparql, conversation_history
 
 
@@ -184,12 +187,12 @@ def execute_sparql_query(sparql_query):
                 return f"Query result: {results.get('boolean', False)}"
             else:
                 # For other query types or formats
-                return json.dumps(execution_result, indent=2)
+                return orjson.dumps(execution_result, option=orjson.OPT_INDENT_2, default=str).decode()
         else:
             # Query failed
             return f"Error executing query: {execution_result.get('error', 'Unknown error')}"
     except Exception as e:
-        logger.error(f"Error executing SPARQL: {e}")
+        logger.error("Error executing SPARQL: %s", e)
         return f"Error executing SPARQL: {e}"
     
 
@@ -19,7 +19,8 @@ from models.embeddings import BiEncoderModel, CrossEncoderModel
 from models.entity_recognition import GLiNERModel
 from tools.sparql_tools import SPARQLTools
 from tools.template_tools import TemplateTools
-from utils.constants import QDRANT_COLLECTIONS
+from utils.constants import MAX_CONVERSATION_HISTORY, QDRANT_COLLECTIONS
+from utils.history_utils import trim_history
 from utils.logging_utils import setup_logging
 
 logger = setup_logging(app_name="nl-to-sparql", enable_colors=True)
@@ -35,7 +36,7 @@ def initialize_databases():
     qdrant_client = QdrantClient(url=os.getenv("QDRANT_URL"))
     for collection in QDRANT_COLLECTIONS:
         if not qdrant_client.collection_exists(collection):
-            logger.info(f"Creating Qdrant collection: {collection}")
+            logger.info("Creating Qdrant collection: %s", collection)
             qdrant_client.create_collection(collection)
 
     # Initialize Elasticsearch client.
@@ -80,8 +81,8 @@ def initialize_tools():
     """Initialize tools for SPARQL templates and utilities."""
     logger.info("Initializing tools...")
     
-    # Initialize template tools
-    template_tools = TemplateTools(templates_dir="templates/sparql")
+    # Initialize template tools from the bundled templates directory
+    template_tools = TemplateTools()
     
     # Initialize SPARQL tools
     sparql_tools = SPARQLTools()
@@ -107,11 +108,10 @@ def initialize_agents(qdrant_client, elastic_client, ontology_store, bi_encoder,
         ontology_store=ontology_store
     )
     
-    # Initialize ontology mapping agent with correct parameters.
+    # Initialize ontology mapping agent on the already loaded ontology store.
     ontology_mapping_agent = OntologyMappingAgent(
-        ontology_path=ontology_store.local_path,
-        ontology_endpoint=ontology_store.endpoint_url,
-        embedding_model_name="sentence-transformers/all-MiniLM-L6-v2"
+        ontology_store=ontology_store,
+        embedding_model=bi_encoder.model
     )
     
     tool_selection_agent = ToolSelectionAgent(
@@ -126,10 +126,10 @@ def initialize_agents(qdrant_client, elastic_client, ontology_store, bi_encoder,
     )
     
     validation_agent = ValidationAgent()
-    sparql_construction_agent = SPARQLConstructionAgent(templates_dir="templates/sparql") 
+    sparql_construction_agent = SPARQLConstructionAgent(template_tools=template_tools)
     sparql_validation_agent = SPARQLValidationAgent()
     query_execution_agent = QueryExecutionAgent(endpoint_url=GRAPHDB_ENDPOINT)
-    tool_execution_agent = ToolExecutionAgent(endpoint_url=GRAPHDB_ENDPOINT)
+    tool_execution_agent = ToolExecutionAgent(query_executor=query_execution_agent)
     response_generation_agent = ResponseGenerationAgent()
 
     # Register slave agents with master agent.
@@ -155,8 +155,8 @@ def process_query(master_agent, query, conversation_history=None):
         conversation_history = []
 
     result = master_agent.process_query(query, conversation_history)
-    logger.info(f"Processed query: {query}")
-    logger.info(f"Generated SPARQL: {result.get('sparql', 'No SPARQL generated')}")
+    logger.info("Processed query: %s", query)
+    logger.info("Generated SPARQL: %s", result.get('sparql', 'No SPARQL generated'))
     return result
 
 
@@ -179,7 +179,7 @@ def interactive_session(master_agent):
         
         try:
             result = process_query(master_agent, user_query, conversation_history)
-            logger.info("\n" + result.get("response", "Sorry, I couldn't process that query."))
+            logger.info("\n%s", result.get("response", "Sorry, I couldn't process that query."))
             
             # Show the SPARQL if requested.
             if "show sparql" in user_query.lower() or "show query" in user_query.lower():
@@ -196,10 +196,13 @@ def interactive_session(master_agent):
                 "role": "assistant",
                 "content": result.get("response", "")
             })
+
+            # Keep the history bounded so long sessions don't grow memory and refinement work
+            trim_history(conversation_history, MAX_CONVERSATION_HISTORY)
             
         except Exception as e:
-            logger.error(f"Error processing query: {e}")
-            logger.info(f"Sorry, there was an error processing your query: {str(e)}")
+            logger.error("Error processing query: %s", e)
+            logger.info("Sorry, there was an error processing your query: %s", e)
     logger.info("Interactive session ended.")
 
 
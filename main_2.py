@@ -15,18 +15,15 @@ from agents.entity_recognition import EntityRecognitionAgent
 from agents.query_refinement import QueryRefinementAgent
 from models.embeddings import BiEncoderModel, CrossEncoderModel
 from models.entity_recognition import GLiNERModel
-from utils.constants import QDRANT_COLLECTIONS
+from utils.constants import MAX_CONVERSATION_HISTORY, QDRANT_COLLECTIONS
+from utils.history_utils import trim_history
 from database.qdrant_client import QdrantClient
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain.output_parsers import ResponseSchema
 from langchain.output_parsers import StructuredOutputParser
-from database.qdrant_client import QdrantClient
 from typing import List, Dict, Any, Optional
-import json
-from utils.constants import QDRANT_COLLECTIONS
 from utils.logging_utils import setup_logging
-from tqdm import tqdm
 from qdrant_client.models import Distance, VectorParams, PointStruct
 
 
@@ -40,7 +37,7 @@ def initialize_databases():
     qdrant_client = QdrantClient(url=os.getenv("QDRANT_URL"))
     for collection in QDRANT_COLLECTIONS:
         if not qdrant_client.collection_exists(collection):
-            logger.info(f"Creating Qdrant collection: {collection}")
+            logger.info("Creating Qdrant collection: %s", collection)
             qdrant_client.create_collection(collection)
 
             if collection == "ontology_embedding":
@@ -48,16 +45,16 @@ def initialize_databases():
                 with open("assets/ontologies/CHeVIE_comment.owl", "r") as f:
                     data = f.read()
                 code_parts = data.split("\n\n\n")
-                points = []
-
-                for idx, code_part in tqdm(enumerate(code_parts)):
-                    embedding = qdrant_client.default_model.encode(code_part)
-                    point = {
+                # Encode all parts in batches rather than one model call per part
+                embeddings = qdrant_client.default_model.encode(code_parts, batch_size=64, show_progress_bar=True)
+                points = [
+                    {
                         "id": idx,
                         "vector": embedding.tolist(),
                         "payload": {"code": code_part}
                     }
-                    points.append(point)
+                    for idx, (code_part, embedding) in enumerate(zip(code_parts, embeddings))
+                ]
 
                 qdrant_client.upsert_points(
                     collection,
@@ -97,7 +94,7 @@ def create_master_agent(qdrant_client, bi_encoder, entity_recognition_model, cro
     )
     plan_formulation_agent = PlanFormulationAgent()
     validation_agent = ValidationAgent()
-    response_generation_agent = ResponseGenerationAgent()
+    response_generation_agent = ResponseGenerationAgent(qdrant_client=qdrant_client)
     master_agent.register_slave_agent("query_refinement", query_refinement_agent)
     master_agent.register_slave_agent("entity_recognition", entity_recognition_agent)
     master_agent.register_slave_agent("plan_formulation", plan_formulation_agent)
@@ -111,8 +108,8 @@ def process_query(master_agent, query, conversation_history=None):
         conversation_history = []
 
     result = master_agent.process_query(query, conversation_history)
-    logger.info(f"Processed query: {query}")
-    logger.info("Generated SPARQL: {}".format(result["response"][-1].get("query", "No SPARQL generated")))
+    logger.info("Processed query: %s", query)
+    logger.info("Generated SPARQL: %s", result["response"][-1].get("query", "No SPARQL generated"))
     return result
 
 def interactive_session(master_agent):
@@ -137,7 +134,7 @@ def interactive_session(master_agent):
             ans = result.get("response", "Sorry, I couldn't process that query.")
             if isinstance(ans, list):
                 ans = ans[-1].get("query", "No SPARQL generated")
-            logger.info("\nSPARQL Query:" + ans)
+            logger.info("\nSPARQL Query:%s", ans)
             
             # Update conversation history.
             conversation_history.append({
@@ -148,10 +145,13 @@ def interactive_session(master_agent):
                 "role": "assistant",
                 "content": ans
             })
+
+            # Keep the history bounded so long sessions don't grow memory and refinement work
+            trim_history(conversation_history, MAX_CONVERSATION_HISTORY)
             
         except Exception as e:
-            logger.error(f"Error processing query: {e}")
-            logger.info(f"Sorry, there was an error processing your query: {str(e)}")
+            logger.error("Error processing query: %s", e)
+            logger.info("Sorry, there was an error processing your query: %s", e)
     logger.info("Interactive session ended.")
 
     return result
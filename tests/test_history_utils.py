@@ -0,0 +1,27 @@
+from utils.history_utils import trim_history
+
+
+def _turns(count):
+    history = []
+    for i in range(count):
+        history.append({"role": "user", "content": f"question {i}"})
+        history.append({"role": "assistant", "content": f"answer {i}"})
+    return history
+
+
+def test_trim_history_keeps_the_latest_whole_turns():
+    history = _turns(4)
+    assert trim_history(history, 5) is history
+    assert history == _turns(4)[4:]
+    assert history[0]["role"] == "user"
+
+
+def test_trim_history_leaves_short_histories_alone():
+    history = _turns(2)
+    assert trim_history(history, 4) == _turns(2)
+
+
+def test_trim_history_non_positive_limit_disables_trimming():
+    history = _turns(3)
+    assert trim_history(history, 0) == _turns(3)
+    assert trim_history(history, -1) == _turns(3)
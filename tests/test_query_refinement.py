@@ -0,0 +1,23 @@
+import pytest
+
+pytest.importorskip("autogen")
+
+from agents.query_refinement import QueryRefinementAgent
+
+
+class _OrthogonalEmbeddings:
+    """Embeds the query and every history turn on different axes, so nothing is similar."""
+
+    def embed(self, texts):
+        return [[1.0 if i == j else 0.0 for j in range(len(texts))] for i in range(len(texts))]
+
+
+def test_relevant_history_keeps_recent_items_without_similar_turns():
+    agent = QueryRefinementAgent.__new__(QueryRefinementAgent)
+    agent.embedding_model = _OrthogonalEmbeddings()
+    history = [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": f"turn {i}"}
+        for i in range(8)
+    ]
+
+    assert agent._get_relevant_history("unrelated question", history) == history[-2:]
@@ -0,0 +1,32 @@
+from tools.sparql_tools import SPARQLTools
+
+
+def test_normalize_query_lowercases_standalone_keywords():
+    assert (
+        SPARQLTools.normalize_query("SELECT ?x\nWHERE { ?x ex:p ?y . FILTER(?y IN (1, 2)) }  LIMIT 5")
+        == "select ?x where { ?x ex:p ?y . filter(?y in (1, 2)) } limit 5"
+    )
+
+
+def test_normalize_query_keeps_keywords_inside_local_names():
+    upper = SPARQLTools.normalize_query("SELECT ?x WHERE { ?x ex:p ex:Foo-IN }")
+    lower = SPARQLTools.normalize_query("SELECT ?x WHERE { ?x ex:p ex:Foo-in }")
+    assert upper == "select ?x where { ?x ex:p ex:Foo-IN }"
+    assert lower == "select ?x where { ?x ex:p ex:Foo-in }"
+    assert upper != lower
+    assert SPARQLTools.normalize_query("ASK { ex:a.IN ex:p ex:Foo%20AS }") == "ask { ex:a.IN ex:p ex:Foo%20AS }"
+
+
+def test_normalize_query_sorts_prefixes_by_name():
+    assert SPARQLTools.normalize_query(
+        "PREFIX foaf: <http://xmlns.com/foaf/0.1/> PREFIX ex: <http://example.org/> SELECT * WHERE { ?s ?p ?o }"
+    ) == SPARQLTools.normalize_query(
+        "PREFIX ex: <http://example.org/> PREFIX foaf: <http://xmlns.com/foaf/0.1/> SELECT * WHERE { ?s ?p ?o }"
+    )
+
+
+def test_normalize_query_keeps_the_order_of_a_redeclared_prefix():
+    a_then_b = SPARQLTools.normalize_query("PREFIX ex: <http://a/> PREFIX ex: <http://b/> SELECT * WHERE { ?s ex:p ?o }")
+    b_then_a = SPARQLTools.normalize_query("PREFIX ex: <http://b/> PREFIX ex: <http://a/> SELECT * WHERE { ?s ex:p ?o }")
+    assert a_then_b == "prefix ex: <http://a/> prefix ex: <http://b/> select * where { ?s ex:p ?o }"
+    assert a_then_b != b_then_a
@@ -6,6 +6,22 @@ Provides utility functions for working with SPARQL queries.
 import re
 from typing import Any, Dict, List, Optional
 
+# String literals and IRIs are kept verbatim; comments are dropped, whitespace collapsed
+# and keywords lowercased (they are case-insensitive in SPARQL, unlike prefixed names and variables).
+# A keyword only counts as one when no name character touches it, so ex:Foo-IN stays distinct from ex:Foo-in
+_SPARQL_TOKEN_PATTERN = re.compile(
+    r'"""[\s\S]*?"""|\'\'\'[\s\S]*?\'\'\'|"(?:[^"\\\n]|\\.)*"|\'(?:[^\'\\\n]|\\.)*\'|<[^<>"{}|^`\\\s]*>|(?:\s+|#[^\n]*)+'
+    r'|(?<![\w:?$\-.%\\\u00b7\u0300-\u036f\u203f\u2040])(?:SELECT|DISTINCT|REDUCED|WHERE|PREFIX|BASE|FILTER|OPTIONAL|UNION|MINUS|GRAPH|SERVICE'
+    r'|BIND|VALUES|AS|FROM|NAMED|ORDER|GROUP|BY|HAVING|ASC|DESC|LIMIT|OFFSET|ASK|CONSTRUCT|DESCRIBE'
+    r'|NOT|EXISTS|IN)(?![\w:\-.%\\\u00b7\u0300-\u036f\u203f\u2040])',
+    re.IGNORECASE
+)
+_PROLOGUE_PATTERN = re.compile(r'^(?:prefix\s*[^\s:<]*:\s*<[^>]*>\s*)+')
+_PREFIX_DECL_PATTERN = re.compile(r'prefix\s*([^\s:<]*):\s*(<[^>]*>)')
+
+# Longer queries are hashed as-is rather than paying for a full tokenizing pass
+_MAX_NORMALIZE_LENGTH = 32 * 1024
+
 
 class SPARQLTools:
     """Utility class for working with SPARQL queries."""
@@ -33,6 +49,39 @@ class SPARQLTools:
             
         return prefix_str + "\n" + sparql_query
     
+    @staticmethod
+    def normalize_query(sparql_query: str) -> str:
+        """
+        Canonicalize the formatting of a SPARQL query, e.g. to build cache keys.
+        
+        Args:
+            sparql_query: The SPARQL query
+            
+        Returns:
+            Query with comments dropped, whitespace collapsed, keywords lowercased
+            and leading PREFIX declarations sorted
+        """
+        if len(sparql_query) > _MAX_NORMALIZE_LENGTH:
+            return sparql_query
+        
+        def replace(match):
+            token = match.group(0)
+            if token[0] == "#" or token[0].isspace():
+                return " "
+            if token[0] in "\"'<":
+                return token
+            return token.lower()
+        normalized = _SPARQL_TOKEN_PATTERN.sub(replace, sparql_query).strip()
+        
+        # PREFIX declarations of different names are order-independent as long as no BASE is involved;
+        # the sort is stable on the name alone, so a redeclared prefix keeps its last binding
+        prologue = _PROLOGUE_PATTERN.match(normalized)
+        if prologue:
+            declarations = sorted(_PREFIX_DECL_PATTERN.findall(prologue.group(0)), key=lambda declaration: declaration[0])
+            prefixes = [f"prefix {name}: {iri}" for name, iri in declarations]
+            normalized = " ".join(prefixes) + " " + normalized[prologue.end():]
+        return normalized
+    
     @staticmethod
     def format_term(term: str, term_type: str) -> str:
         """
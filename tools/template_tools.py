@@ -20,7 +20,7 @@ class TemplateTools:
             templates_dir: Directory containing SPARQL query templates
         """
         self.templates_dir = templates_dir or os.path.join(os.path.dirname(__file__), "../templates/sparql")
-        self.templates = self._load_templates()
+        self.reload_templates()
     
     def _load_templates(self) -> List[Dict[str, Any]]:
         """
@@ -50,6 +50,15 @@ class TemplateTools:
         
         return templates
     
+    def reload_templates(self):
+        """Reload the templates from the templates directory and rebuild the query type index."""
+        self.templates = self._load_templates()
+        
+        # Templates grouped by query type, so lookups don't rescan every template
+        self.templates_by_type = {}
+        for template in self.templates:
+            self.templates_by_type.setdefault(template.get("query_type"), []).append(template)
+    
     def get_template(self, template_id: str) -> Optional[Dict[str, Any]]:
         """
         Get a template by ID.
@@ -75,7 +84,7 @@ class TemplateTools:
         Returns:
             List of matching templates
         """
-        return [t for t in self.templates if t.get("query_type") == query_type.upper()]
+        return list(self.templates_by_type.get(query_type.upper(), []))
     
     def find_templates_by_keywords(self, keywords: List[str]) -> List[Dict[str, Any]]:
         """
@@ -32,7 +32,7 @@ class ToolRegistry:
             # Create tools directory if it doesn't exist
             if not os.path.exists(self.tools_dir):
                 os.makedirs(self.tools_dir)
-                logger.info(f"Created tools directory: {self.tools_dir}")
+                logger.info("Created tools directory: %s", self.tools_dir)
                 
                 # Create example tool definition
                 self._create_example_tool()
@@ -47,7 +47,7 @@ class ToolRegistry:
                         
                     tool_id = tool_data.get("id")
                     if not tool_id:
-                        logger.warning(f"Tool definition missing ID: {filename}")
+                        logger.warning("Tool definition missing ID: %s", filename)
                         continue
                         
                     # Add tool to registry
@@ -59,9 +59,9 @@ class ToolRegistry:
                         self.categories[category] = []
                     self.categories[category].append(tool_id)
                     
-            logger.info(f"Loaded {len(self.tools)} tools in {len(self.categories)} categories")
+            logger.info("Loaded %d tools in %d categories", len(self.tools), len(self.categories))
         except Exception as e:
-            logger.error(f"Error loading tools: {e}")
+            logger.error("Error loading tools: %s", e)
     
     def _create_example_tool(self):
         """Create an example tool definition file."""
@@ -233,7 +233,7 @@ class ToolRegistry:
             with open(tool_path, "w") as f:
                 json.dump(tool, f, indent=2)
                 
-        logger.info(f"Created {len(example_tools)} example tool definitions")
+        logger.info("Created %d example tool definitions", len(example_tools))
     
     def get_tool(self, tool_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -329,7 +329,7 @@ class ToolRegistry:
             
             return True
         except Exception as e:
-            logger.error(f"Error registering tool: {e}")
+            logger.error("Error registering tool: %s", e)
             return False
     
     def unregister_tool(self, tool_id: str) -> bool:
@@ -344,7 +344,7 @@ class ToolRegistry:
         """
         try:
             if tool_id not in self.tools:
-                logger.warning(f"Tool not found: {tool_id}")
+                logger.warning("Tool not found: %s", tool_id)
                 return False
                 
             # Remove tool file
@@ -362,7 +362,7 @@ class ToolRegistry:
                 
             return True
         except Exception as e:
-            logger.error(f"Error unregistering tool: {e}")
+            logger.error("Error unregistering tool: %s", e)
             return False
     
     def get_tool_vector_data(self) -> List[Dict[str, Any]]:
@@ -4,4 +4,5 @@ import os
 QDRANT_COLLECTIONS = frozenset(["query_patterns", "sparql_examples", "conversation_history", "refinement_examples", "ontology_embedding"])
 VECTOR_SIMILARITY_THRESHOLD = os.getenv("VECTOR_SIMILARITY_THRESHOLD", 0.25)
 TOP_K_DRANT_QUERIES = os.getenv("TOP_K_DRANT_QUERIES", 2)
-QDRANT_SEARCH_THRESHOLD = os.getenv("QDRANT_SEARCH_THRESHOLD", 0.5)
\ No newline at end of file
+QDRANT_SEARCH_THRESHOLD = os.getenv("QDRANT_SEARCH_THRESHOLD", 0.5)
+MAX_CONVERSATION_HISTORY = int(os.getenv("MAX_CONVERSATION_HISTORY", 50))
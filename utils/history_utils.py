@@ -0,0 +1,25 @@
+from typing import Dict, List
+
+
+def trim_history(history: List[Dict[str, str]], max_items: int) -> List[Dict[str, str]]:
+    """
+    Drop the oldest conversation turns in place so at most max_items messages remain.
+
+    Whole turns are removed: the kept history always starts at a user message, so an
+    assistant reply is never left without the question it answered.
+
+    Args:
+        history: Conversation history of role/content messages, oldest first
+        max_items: Maximum number of messages to keep; zero or less disables trimming
+
+    Returns:
+        The trimmed history
+    """
+    if max_items <= 0 or len(history) <= max_items:
+        return history
+
+    start = len(history) - max_items
+    while start < len(history) and history[start].get("role") != "user":
+        start += 1
+    del history[:start]
+    return history
@@ -1,10 +1,11 @@
-import json
 import logging
 import os
 import sys
 from datetime import datetime
 from typing import List, Optional
 
+import orjson
+
 # Default log levels
 DEFAULT_CONSOLE_LEVEL = logging.INFO
 DEFAULT_FILE_LEVEL = logging.DEBUG
@@ -31,6 +32,9 @@ LEVEL_COLORS = {
     logging.CRITICAL: COLORS["BOLD"] + COLORS["RED"]
 }
 
+# Arguments of the last setup_logging call that configured the root logger
+_active_config = None
+
 class ColoredFormatter(logging.Formatter):
     """Custom formatter adding colors to log level names in console output"""
     
@@ -61,7 +65,7 @@ class JSONFormatter(logging.Formatter):
             if key not in log_data and not key.startswith("_") and key != "args":
                 log_data[key] = value
         
-        return json.dumps(log_data)
+        return orjson.dumps(log_data, default=str).decode()
 
 def setup_logging(
     app_name: str = "nl-to-sparql",
@@ -85,6 +89,15 @@ def setup_logging(
     Returns:
         Configured logger instance
     """
+    global _active_config
+    
+    # Modules call this at import time; only the first call with a given configuration
+    # installs handlers, later ones reuse them instead of opening another log file
+    config = (app_name, console_level, file_level, log_dir, enable_json, enable_colors)
+    if config == _active_config:
+        return logging.getLogger(app_name)
+    _active_config = config
+    
     # Create logs directory if it doesn"t exist
     if not os.path.exists(log_dir):
         os.makedirs(log_dir)
@@ -101,7 +114,8 @@ def setup_logging(
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(console_level)
     
-    if enable_colors:
+    # ANSI colors only make sense when the console is an interactive terminal
+    if enable_colors and console_handler.stream.isatty():
         console_format = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
         console_formatter = ColoredFormatter(console_format)
     else:
@@ -129,7 +143,10 @@ def setup_logging(
     
     # Create a specific logger for the application
     app_logger = logging.getLogger(app_name)
-    app_logger.info(f"Logging initialized: console={logging.getLevelName(console_level)}, file={logging.getLevelName(file_level)}")
+    app_logger.info(
+        "Logging initialized: console=%s, file=%s",
+        logging.getLevelName(console_level), logging.getLevelName(file_level)
+    )
     
     return app_logger
 
@@ -212,7 +229,7 @@ def log_execution_time(logger: Optional[logging.Logger] = None):
             end_time = time.time()
             
             execution_time = end_time - start_time
-            func_logger.debug(f"Function '{func.__name__}' executed in {execution_time:.4f} seconds")
+            func_logger.debug("Function '%s' executed in %.4f seconds", func.__name__, execution_time)
             
             return result
         return wrapper